@@ -4,16 +4,7 @@ Opus Memory - A persistent memory system for AI continuity.
 Designed for remembering what matters while avoiding hoarding or surveillance.
 """
 
-from opus_memory.system import MemorySystem
-from opus_memory.models import (
-    Memory,
-    EpisodicMemory,
-    SemanticMemory,
-    ProceduralMemory,
-    IdentityMemory,
-    MemoryType,
-)
-from opus_memory.consent import ConsentConfig, ConsentLayer
+from importlib.util import find_spec
 
 __version__ = "0.1.0"
 __all__ = [
@@ -28,10 +19,38 @@ __all__ = [
     "ConsentLayer",
 ]
 
-# Optional Discord bot import
-try:
-    from opus_memory.discord_bot import OpusDiscordBot, BotConfig, run_bot
+# Optional Discord bot exports (only when discord.py is installed)
+if find_spec("discord") is not None:
     __all__.extend(["OpusDiscordBot", "BotConfig", "run_bot"])
-except ImportError:
-    # discord.py not installed
-    pass
+
+# Exports load on first use, so importing a submodule (e.g. the CLI) doesn't
+# pay for pydantic models, ChromaDB, sentence-transformers or discord.py
+_LAZY_EXPORTS = {
+    "Memory": "opus_memory.models",
+    "EpisodicMemory": "opus_memory.models",
+    "SemanticMemory": "opus_memory.models",
+    "ProceduralMemory": "opus_memory.models",
+    "IdentityMemory": "opus_memory.models",
+    "MemoryType": "opus_memory.models",
+    "ConsentConfig": "opus_memory.consent",
+    "ConsentLayer": "opus_memory.consent",
+    "MemorySystem": "opus_memory.system",
+    "OpusDiscordBot": "opus_memory.discord_bot",
+    "BotConfig": "opus_memory.discord_bot",
+    "run_bot": "opus_memory.discord_bot",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    try:
+        value = getattr(import_module(module_name), name)
+    except ImportError as e:
+        # discord.py not installed
+        raise AttributeError(f"{name} is unavailable: {e}") from e
+    globals()[name] = value
+    return value
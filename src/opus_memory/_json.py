@@ -0,0 +1,40 @@
+"""
+JSON helpers for Opus Memory.
+
+Uses orjson when it is installed (the `speedups` extra) and falls back to
+the standard library otherwise.
+"""
+
+import json
+from typing import Any, TextIO
+
+try:
+    import orjson
+except ImportError:
+    # orjson not installed
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dump_pretty(obj: Any, fp: TextIO) -> None:
+    """Write obj to a text file as 2-space indented JSON."""
+    if orjson is not None:
+        fp.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode())
+    else:
+        json.dump(obj, fp, indent=2, default=str)
@@ -5,10 +5,36 @@ for problems it observes or improvements it wants to make.
 """
 
 import logging
-from anthropic import Anthropic
+import re
+import time
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Optional
+
+from opus_memory import _json
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 logger = logging.getLogger(__name__)
 
+# JSON extraction patterns, compiled once rather than on every analysis
+_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.+?\})\s*```', re.DOTALL)
+_RAW_JSON_RE = re.compile(r'\{[^{}]*"should_file_issue"[^{}]*\}', re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def get_anthropic_client(api_key: Optional[str] = None) -> "Anthropic":
+    """Get a shared Anthropic client per API key.
+
+    Reusing one client keeps its HTTP connection pool (and TLS sessions) warm
+    across calls. HTTP/2 is enabled when the optional h2 package is installed.
+    """
+    from anthropic import Anthropic, DefaultHttpxClient
+
+    http_client = DefaultHttpxClient(http2=find_spec("h2") is not None)
+    return Anthropic(api_key=api_key, http_client=http_client)
+
 
 class AutonomousIssueDetector:
     """Analyzes conversations to detect issues worth filing."""
@@ -52,16 +78,30 @@ Conversation context:
 {context}
 
 Analyze this and decide."""
+
+    # Split around the context marker once so building the prompt is a plain
+    # concatenation (the literal JSON braces above also rule out str.format)
+    _PROMPT_PREFIX, _PROMPT_SUFFIX = DETECTION_PROMPT.split("{context}", 1)
     
-    def __init__(self, anthropic_client: Anthropic, model: str = "claude-sonnet-4-20250514"):
+    def __init__(
+        self,
+        anthropic_client: Optional["Anthropic"] = None,
+        model: str = "claude-sonnet-4-20250514",
+        request_options: Optional[dict] = None,
+    ):
         """Initialize the detector.
         
         Args:
-            anthropic_client: Anthropic API client
+            anthropic_client: Anthropic API client (defaults to the shared
+                client from get_anthropic_client)
             model: Model to use for analysis
+            request_options: Extra keyword arguments for live messages.create
+                calls (e.g. extra_headers/extra_body to opt into a provider's
+                latency-optimized inference). Not applied to batch requests.
         """
-        self.client = anthropic_client
+        self.client = anthropic_client or get_anthropic_client()
         self.model = model
+        self.request_options = request_options or {}
     
     def analyze_for_issues(self, conversation_context: str) -> dict:
         """Analyze a conversation to detect issues worth filing.
@@ -74,39 +114,101 @@ Analyze this and decide."""
         """
         try:
             response = self.client.messages.create(
-                model=self.model,
-                max_tokens=512,
-                system=self.DETECTION_PROMPT.format(context=conversation_context),
-                messages=[{"role": "user", "content": "Analyze this conversation."}],
+                **self._request_params(conversation_context), **self.request_options
             )
+            return self._parse_response(response.content[0].text)
             
-            text = response.content[0].text
-            
-            # Extract JSON - try multiple patterns
-            import json
-            import re
+        except Exception as e:
+            logger.error(f"Error analyzing for issues: {e}")
+            return {"should_file_issue": False, "reason": f"Analysis error: {e}"}
+    
+    def analyze_many_for_issues(
+        self, conversation_contexts: list[str], poll_interval: float = 5.0
+    ) -> list[dict]:
+        """Analyze several conversations in a single Message Batches request.
+        
+        Batches trade latency for throughput (results can take minutes), so
+        this suits analyzing a backlog of conversations. Use
+        analyze_for_issues for live, latency-sensitive checks.
+        
+        Args:
+            conversation_contexts: The conversation texts to analyze
+            poll_interval: Seconds to wait between batch status checks
             
-            # Try to find JSON block in markdown code fence
-            json_match = re.search(r'```(?:json)?\s*(\{.+?\})\s*```', text, re.DOTALL)
-            if json_match:
-                text = json_match.group(1)
-            else:
-                # Try to find raw JSON object
-                json_match = re.search(r'\{[^{}]*"should_file_issue"[^{}]*\}', text, re.DOTALL)
-                if json_match:
-                    text = json_match.group(0)
+        Returns:
+            One dict per context, in input order, with the same keys as
+            analyze_for_issues
+        """
+        if not conversation_contexts:
+            return []
+        
+        try:
+            batches = self.client.messages.batches
+            batch = batches.create(
+                requests=[
+                    {"custom_id": str(i), "params": self._request_params(context)}
+                    for i, context in enumerate(conversation_contexts)
+                ]
+            )
+            logger.debug(f"Submitted issue-detection batch {batch.id}")
             
-            # Clean up the text
-            text = text.strip()
+            while batch.processing_status != "ended":
+                time.sleep(poll_interval)
+                batch = batches.retrieve(batch.id)
             
-            result = json.loads(text)
-            logger.debug(f"Issue detection result: {result}")
-            return result
+            results = [
+                {"should_file_issue": False, "reason": "No result returned for request"}
+                for _ in conversation_contexts
+            ]
+            for entry in batches.results(batch.id):
+                index = int(entry.custom_id)
+                if entry.result.type == "succeeded":
+                    results[index] = self._parse_response(entry.result.message.content[0].text)
+                else:
+                    results[index] = {
+                        "should_file_issue": False,
+                        "reason": f"Batch request {entry.result.type}",
+                    }
+            return results
             
-        except json.JSONDecodeError as e:
+        except Exception as e:
+            logger.error(f"Error batch-analyzing for issues: {e}")
+            return [
+                {"should_file_issue": False, "reason": f"Analysis error: {e}"}
+                for _ in conversation_contexts
+            ]
+    
+    def _request_params(self, conversation_context: str) -> dict:
+        """Build the Messages API parameters for analyzing one conversation."""
+        return {
+            "model": self.model,
+            "max_tokens": 512,
+            "system": self._PROMPT_PREFIX + conversation_context + self._PROMPT_SUFFIX,
+            "messages": [{"role": "user", "content": "Analyze this conversation."}],
+        }
+    
+    def _parse_response(self, text: str) -> dict:
+        """Extract the detection result JSON from a model response."""
+        # Extract JSON - try multiple patterns
+        # Try to find JSON block in markdown code fence
+        json_match = _FENCE_RE.search(text)
+        if json_match:
+            text = json_match.group(1)
+        else:
+            # Try to find raw JSON object
+            json_match = _RAW_JSON_RE.search(text)
+            if json_match:
+                text = json_match.group(0)
+        
+        # Clean up the text
+        text = text.strip()
+        
+        try:
+            result = _json.loads(text)
+        except _json.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {e}")
             logger.debug(f"Failed to parse text: {text[:200]}")
             return {"should_file_issue": False, "reason": f"JSON parse error: {e}"}
-        except Exception as e:
-            logger.error(f"Error analyzing for issues: {e}")
-            return {"should_file_issue": False, "reason": f"Analysis error: {e}"}
+        
+        logger.debug(f"Issue detection result: {result}")
+        return result
@@ -4,37 +4,170 @@ Command-line interface for Opus Memory.
 Provides interactive commands for storing, searching, and managing memories.
 """
 
-import json
 import sys
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
 import click
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich.markdown import Markdown
 
-from opus_memory.system import MemorySystem
-from opus_memory.models import MemoryType, ConfidenceLevel
+from opus_memory import _json
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from opus_memory.system import MemorySystem
+
+# Panels, prompts, tables, numpy, the pydantic models and the memory system
+# itself are imported inside the commands that use them so `--help` and
+# friends start fast. (Click's own command setup is only a few milliseconds.)
 
 
 console = Console()
 
+# Numeric shortcuts accepted by the interactive `store` prompt
+_TYPE_MAP = {
+    "1": "episodic",
+    "2": "semantic",
+    "3": "procedural",
+    "4": "identity",
+}
+
+# Border color and prebuilt title markup for each memory type. Keyed by the
+# MemoryType value; MemoryType is a str enum, so its members look up directly.
+_TYPE_STYLE = {
+    memory_type: (color, f"[{color}][{memory_type.upper()}][/{color}]")
+    for memory_type, color in (
+        ("episodic", "cyan"),
+        ("semantic", "green"),
+        ("procedural", "yellow"),
+        ("identity", "magenta"),
+    )
+}
+
 # Global memory system instance
-_memory_system: Optional[MemorySystem] = None
+_memory_system: Optional["MemorySystem"] = None
 
 
-def get_memory_system(storage_path: str = "./opus_memories") -> MemorySystem:
+def get_memory_system(storage_path: str = "./opus_memories") -> "MemorySystem":
     """Get or create the memory system instance."""
     global _memory_system
     if _memory_system is None:
+        from opus_memory.system import MemorySystem
+
         _memory_system = MemorySystem(storage_path=storage_path)
     return _memory_system
 
 
+class SemanticQueryCache:
+    """
+    Reuses remember() results for paraphrased queries.
+
+    Keeps the unit-normalized embeddings of recent queries; a new query whose
+    cosine similarity to a cached one meets the threshold gets that query's
+    results back without another vector search.
+    """
+
+    def __init__(
+        self, memory: "MemorySystem", threshold: float = 0.95, max_entries: int = 512
+    ):
+        self.memory = memory
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # Parallel lists, least recently used first
+        self._vectors: list["np.ndarray"] = []
+        self._limits: list[int] = []
+        self._results: list[list] = []
+
+    def remember(self, query: str, n_results: int = 5) -> list:
+        """Explicit recall, served from a semantically similar prior query if possible."""
+        import numpy as np
+
+        # Embeddings come back as unit-length float32 arrays
+        query_vec = self.memory.embedding_engine.embed(query)
+
+        if self._vectors:
+            sims = np.stack(self._vectors) @ query_vec
+            sims[np.asarray(self._limits) != n_results] = -1.0
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                self._touch(best)
+                return self._results[-1]
+
+        results = self.memory.remember(query=query, n_results=n_results)
+        self._vectors.append(query_vec)
+        self._limits.append(n_results)
+        self._results.append(results)
+        if len(self._vectors) > self.max_entries:
+            self._evict(0)
+        return results
+
+    def clear(self):
+        """Drop all cached queries."""
+        self._vectors.clear()
+        self._limits.clear()
+        self._results.clear()
+
+    def _touch(self, index: int):
+        """Move an entry to the most-recently-used position."""
+        for entries in (self._vectors, self._limits, self._results):
+            entries.append(entries.pop(index))
+
+    def _evict(self, index: int):
+        """Drop an entry from the cache."""
+        for entries in (self._vectors, self._limits, self._results):
+            del entries[index]
+
+
+_semantic_cache: Optional[SemanticQueryCache] = None
+
+
+def get_semantic_cache() -> SemanticQueryCache:
+    """Get or create the semantic query cache over the memory system."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticQueryCache(get_memory_system())
+    return _semantic_cache
+
+
+def _run_query(kind: str, query: str, memory_type: Optional[str], limit: int) -> list:
+    """Run a search/remember query against the shared memory system."""
+    from opus_memory.models import MemoryType
+
+    memory = get_memory_system()
+    if kind == "remember":
+        return memory.remember(query=query, n_results=limit)
+    types = [MemoryType(memory_type)] if memory_type else None
+    return memory.retrieve(query=query, memory_types=types, n_results=limit)
+
+
+@lru_cache(maxsize=256)
+def _cached_query(
+    kind: str, query: str, memory_type: Optional[str], limit: int
+) -> tuple:
+    """Exact-key LRU in front of the semantic cache (remember) or the store (search)."""
+    if kind == "remember":
+        return tuple(get_semantic_cache().remember(query, n_results=limit))
+    return tuple(_run_query(kind, query, memory_type, limit))
+
+
+def _query(
+    kind: str, query: str, memory_type: Optional[str], limit: int, use_cache: bool
+) -> list:
+    """Dispatch a query, bypassing both caches when caching is disabled."""
+    if use_cache:
+        return list(_cached_query(kind, query, memory_type, limit))
+    return _run_query(kind, query, memory_type, limit)
+
+
+def _clear_query_caches():
+    """Invalidate cached query results after the memory store changes."""
+    _cached_query.cache_clear()
+    if _semantic_cache is not None:
+        _semantic_cache.clear()
+
+
 @click.group()
 @click.option(
     "--storage",
@@ -57,6 +190,9 @@ def main(ctx, storage):
 @click.pass_context
 def store(ctx):
     """Interactively store a new memory."""
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+
     memory = get_memory_system(ctx.obj["storage"])
 
     console.print(
@@ -79,13 +215,7 @@ def store(ctx):
         default="1",
     )
 
-    type_map = {
-        "1": "episodic",
-        "2": "semantic",
-        "3": "procedural",
-        "4": "identity",
-    }
-    memory_type = type_map.get(type_choice, type_choice)
+    memory_type = _TYPE_MAP.get(type_choice, type_choice)
 
     # Get content
     console.print(f"\n[bold]Describe the {memory_type} memory:[/bold]")
@@ -165,6 +295,7 @@ def store(ctx):
         )
 
     if memory_id:
+        _clear_query_caches()
         console.print(f"\n[green]✓ Memory stored with ID: {memory_id}[/green]")
     else:
         console.print(
@@ -176,22 +307,24 @@ def store(ctx):
 @click.argument("query")
 @click.option("--type", "-t", "memory_type", help="Filter by memory type")
 @click.option("--limit", "-n", default=10, help="Maximum number of results")
+@click.option("--no-cache", is_flag=True, help="Bypass the in-process query cache")
 @click.pass_context
-def search(ctx, query, memory_type, limit):
+def search(ctx, query, memory_type, limit, no_cache):
     """Search memories by semantic similarity."""
-    memory = get_memory_system(ctx.obj["storage"])
+    from opus_memory.models import MemoryType
+
+    get_memory_system(ctx.obj["storage"])
 
-    types = None
     if memory_type:
         try:
-            types = [MemoryType(memory_type)]
+            MemoryType(memory_type)
         except ValueError:
             console.print(f"[red]Invalid memory type: {memory_type}[/red]")
             return
 
     console.print(f"\n[bold]Searching for:[/bold] {query}\n")
 
-    results = memory.retrieve(query=query, memory_types=types, n_results=limit)
+    results = _query("search", query, memory_type, limit, use_cache=not no_cache)
 
     if not results:
         console.print("[yellow]No memories found.[/yellow]")
@@ -203,14 +336,15 @@ def search(ctx, query, memory_type, limit):
 @main.command()
 @click.argument("query")
 @click.option("--limit", "-n", default=5, help="Maximum number of results")
+@click.option("--no-cache", is_flag=True, help="Bypass the in-process query cache")
 @click.pass_context
-def remember(ctx, query, limit):
+def remember(ctx, query, limit, no_cache):
     """Explicit recall - 'remember when...'"""
-    memory = get_memory_system(ctx.obj["storage"])
+    get_memory_system(ctx.obj["storage"])
 
     console.print(f"\n[bold]Remembering:[/bold] {query}\n")
 
-    results = memory.remember(query=query, n_results=limit)
+    results = _query("remember", query, None, limit, use_cache=not no_cache)
 
     if not results:
         console.print("[yellow]I don't recall anything about that.[/yellow]")
@@ -238,6 +372,8 @@ def associate(ctx, query, limit, expand, memory_type):
     Example: "what to buy deckard for christmas" finds not just mentions of Deckard,
     but also what Deckard values, prefers, and is interested in.
     """
+    from opus_memory.models import MemoryType
+
     memory = get_memory_system(ctx.obj["storage"])
 
     types = None
@@ -324,6 +460,8 @@ def identity(ctx):
 @click.pass_context
 def stats(ctx):
     """Show memory statistics."""
+    from rich.table import Table
+
     memory = get_memory_system(ctx.obj["storage"])
 
     stats = memory.stats()
@@ -346,10 +484,13 @@ def stats(ctx):
 @click.pass_context
 def forget(ctx, memory_id):
     """Delete a memory by ID."""
+    from rich.prompt import Confirm
+
     memory = get_memory_system(ctx.obj["storage"])
 
     if Confirm.ask(f"Are you sure you want to forget memory {memory_id}?"):
         if memory.forget(memory_id):
+            _clear_query_caches()
             console.print(f"[green]✓ Memory {memory_id} has been forgotten.[/green]")
         else:
             console.print(f"[red]Could not find memory {memory_id}[/red]")
@@ -363,19 +504,20 @@ def export(ctx, fmt, output_file):
     """Export all memories."""
     memory = get_memory_system(ctx.obj["storage"])
 
-    data = memory.export()
-
-    if fmt == "json":
-        output = json.dumps(data, indent=2, default=str)
-    else:
+    if fmt != "json":
         console.print(f"[red]Unsupported format: {fmt}[/red]")
         return
 
+    data = memory.export()
+
+    # Serialize straight into the destination rather than building one big string
     if output_file:
-        Path(output_file).write_text(output)
+        with open(output_file, "w", encoding="utf-8") as fp:
+            _json.dump_pretty(data, fp)
         console.print(f"[green]✓ Exported to {output_file}[/green]")
     else:
-        console.print(output)
+        _json.dump_pretty(data, sys.stdout)
+        sys.stdout.write("\n")
 
 
 @main.command("import")
@@ -386,32 +528,30 @@ def import_memories(ctx, input_file):
     memory = get_memory_system(ctx.obj["storage"])
 
     try:
-        data = json.loads(Path(input_file).read_text())
+        with open(input_file, "rb") as fp:
+            data = _json.loads(fp.read())
     except Exception as e:
         console.print(f"[red]Error reading file: {e}[/red]")
         return
 
     count = memory.import_memories(data)
+    _clear_query_caches()
     console.print(f"[green]✓ Imported {count} memories[/green]")
 
 
 def _display_memories(memories: list):
     """Display a list of memories in a nice format."""
-    type_colors = {
-        MemoryType.EPISODIC: "cyan",
-        MemoryType.SEMANTIC: "green",
-        MemoryType.PROCEDURAL: "yellow",
-        MemoryType.IDENTITY: "magenta",
-    }
+    from rich.panel import Panel
+
+    from opus_memory.models import ConfidenceLevel
 
     for mem in memories:
-        color = type_colors.get(mem.memory_type, "white")
-        type_label = mem.memory_type.value.upper()
+        color, header = _TYPE_STYLE[mem.memory_type]
 
         # Build header
-        header = f"[{color}][{type_label}][/{color}]"
-        if hasattr(mem, "category"):
-            header += f" ({mem.category})"
+        category = mem.render_category()
+        if category:
+            header += f" ({category})"
 
         # Build metadata
         meta_parts = []
@@ -420,16 +560,7 @@ def _display_memories(memories: list):
         if mem.confidence != ConfidenceLevel.CONFIDENT:
             meta_parts.append(f"Confidence: {mem.confidence.value}")
 
-        if hasattr(mem, "emotional_valence") and mem.emotional_valence != 0:
-            emoji = "😊" if mem.emotional_valence > 0 else "😔"
-            meta_parts.append(f"Emotional: {mem.emotional_valence:+.1f} {emoji}")
-
-        if hasattr(mem, "entities") and mem.entities:
-            meta_parts.append(f"Entities: {', '.join(mem.entities)}")
-
-        if hasattr(mem, "outcome"):
-            outcome_emoji = {"positive": "✓", "negative": "✗", "neutral": "○"}
-            meta_parts.append(f"Outcome: {outcome_emoji.get(mem.outcome, '?')} {mem.outcome}")
+        meta_parts.extend(mem.render_meta_parts())
 
         # Display
         console.print(Panel(
@@ -6,12 +6,19 @@ Implements the key questions:
 - Before retrieving: "Is this relevant or am I just pattern-matching?"
 """
 
+import re
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
 from opus_memory.models import Memory, MemoryType, ConsentCheck
 
+# Signals for reflective consent, matched against lowercased content. Only the
+# leading edge is anchored so "factually" isn't a correction but "mistakes" is.
+_CORRECTION_RE = re.compile(r"\b(?:actually|correction|i was wrong|mistake)")
+_EMOTIONAL_RE = re.compile(r"\b(?:felt|moved|grateful|frustrated|curious|excited)")
+_SELF_REFLECTION_RE = re.compile(r"\b(?:i noticed|i realized|i tend to)")
+
 
 class StorageReason(str, Enum):
     """Why we're storing a memory."""
@@ -64,6 +71,19 @@ class ConsentConfig:
             self.never_store_patterns = []
 
 
+# Candidate count above which retrieval filtering switches to NumPy masks
+_VECTORIZE_MIN_CANDIDATES = 64
+
+
+def _compile_patterns(patterns: list[str]) -> Optional[re.Pattern]:
+    """Compile literal patterns into one case-insensitive alternation (None if empty)."""
+    # Longest first so a pattern that prefixes another doesn't shadow it
+    literals = sorted({p for p in patterns if p}, key=len, reverse=True)
+    if not literals:
+        return None
+    return re.compile("|".join(re.escape(p) for p in literals), re.IGNORECASE)
+
+
 class ConsentLayer:
     """
     Implements consent checks for memory operations.
@@ -74,7 +94,32 @@ class ConsentLayer:
 
     def __init__(self, config: Optional[ConsentConfig] = None):
         self.config = config or ConsentConfig()
-        self._user_deletions: set[str] = set()  # Track user-requested deletions
+        # Track user-requested deletions. A plain set is already an O(1) exact
+        # check; a Bloom filter would still need this set to rule out false
+        # positives, and deleted memories are removed from the store anyway.
+        self._user_deletions: set[str] = set()
+
+        # Scan content once per check instead of once per pattern
+        self._never_store_re = _compile_patterns(self.config.never_store_patterns)
+        self._never_store_names = {p.casefold(): p for p in self.config.never_store_patterns}
+        self._redact_re = _compile_patterns(self.config.redact_patterns)
+
+        # Effective relevance threshold per retrieval reason. Explicit requests
+        # are more lenient; context-triggered retrieval requires higher relevance.
+        base_threshold = self.config.require_relevance_threshold
+        self._relevance_thresholds = {
+            RetrievalReason.EXPLICIT_REQUEST: base_threshold,
+            RetrievalReason.CONTEXT_TRIGGERED: base_threshold + 0.1,
+            RetrievalReason.IDENTITY_CHECK: base_threshold,
+            RetrievalReason.SKILL_APPLICATION: base_threshold,
+        }
+
+        self._auto_approve_map = {
+            MemoryType.EPISODIC: self.config.auto_approve_episodic,
+            MemoryType.SEMANTIC: self.config.auto_approve_semantic,
+            MemoryType.PROCEDURAL: self.config.auto_approve_procedural,
+            MemoryType.IDENTITY: self.config.auto_approve_identity,
+        }
 
     def check_storage_consent(
         self,
@@ -89,9 +134,14 @@ class ConsentLayer:
 
         Asks: "Would future-me want to remember this?"
         """
-        # Check for patterns that should never be stored
-        for pattern in self.config.never_store_patterns:
-            if pattern.lower() in content.lower():
+        # Check for patterns that should never be stored. Matching runs on the
+        # original content (case-insensitively) rather than a casefolded copy,
+        # since casefolding can change string length and break redaction offsets.
+        if self._never_store_re is not None:
+            match = self._never_store_re.search(content)
+            if match:
+                matched = match.group(0)
+                pattern = self._never_store_names.get(matched.casefold(), matched)
                 return ConsentCheck(
                     should_proceed=False,
                     reason=f"Content matches never-store pattern: {pattern}",
@@ -112,14 +162,7 @@ class ConsentLayer:
             )
 
         # Check auto-approval based on type
-        auto_approve_map = {
-            MemoryType.EPISODIC: self.config.auto_approve_episodic,
-            MemoryType.SEMANTIC: self.config.auto_approve_semantic,
-            MemoryType.PROCEDURAL: self.config.auto_approve_procedural,
-            MemoryType.IDENTITY: self.config.auto_approve_identity,
-        }
-
-        if not auto_approve_map.get(memory_type, True):
+        if not self._auto_approve_map.get(memory_type, True):
             return ConsentCheck(
                 should_proceed=False,
                 reason=f"Auto-approval disabled for {memory_type.value} memories",
@@ -134,9 +177,8 @@ class ConsentLayer:
 
         # Redact sensitive patterns
         modified_content = content
-        for pattern in self.config.redact_patterns:
-            if pattern.lower() in modified_content.lower():
-                modified_content = modified_content.replace(pattern, "[REDACTED]")
+        if self._redact_re is not None:
+            modified_content = self._redact_re.sub("[REDACTED]", content)
 
         # All checks passed
         return ConsentCheck(
@@ -156,36 +198,35 @@ class ConsentLayer:
 
         Asks: "Is this relevant or am I just pattern-matching?"
         """
-        filtered = []
-
-        for memory, similarity in candidate_memories:
-            # Skip user-deleted memories
-            if memory.id in self._user_deletions:
-                continue
-
-            # Check relevance threshold
-            if similarity < self.config.require_relevance_threshold:
-                continue
-
-            # For explicit requests, be more lenient
-            if reason == RetrievalReason.EXPLICIT_REQUEST:
-                filtered.append((memory, similarity))
-                continue
+        # Skip user-deleted memories
+        candidates = [
+            (memory, similarity)
+            for memory, similarity in candidate_memories
+            if memory.id not in self._user_deletions
+        ]
+        limit = self.config.max_results_per_query
+        threshold = self._relevance_thresholds.get(
+            reason, self.config.require_relevance_threshold
+        )
 
-            # For context-triggered retrieval, require higher relevance
-            if reason == RetrievalReason.CONTEXT_TRIGGERED:
-                if similarity < self.config.require_relevance_threshold + 0.1:
-                    continue
+        if len(candidates) >= _VECTORIZE_MIN_CANDIDATES:
+            import numpy as np
 
-            # Check if memory is still valid (not too decayed)
-            if memory.decay_rate > 0:
-                # Could add time-based decay calculation here
-                pass
+            sims = np.fromiter(
+                (similarity for _, similarity in candidates),
+                dtype=np.float64,
+                count=len(candidates),
+            )
+            return [candidates[i] for i in np.flatnonzero(sims >= threshold)[:limit]]
 
-            filtered.append((memory, similarity))
+        filtered = [
+            (memory, similarity)
+            for memory, similarity in candidates
+            if similarity >= threshold
+        ]
 
         # Limit results
-        return filtered[: self.config.max_results_per_query]
+        return filtered[:limit]
 
     def request_deletion(self, memory_id: str) -> bool:
         """Mark a memory for deletion (user request)."""
@@ -232,26 +273,18 @@ class ReflectiveConsent:
         if memory_type == MemoryType.IDENTITY:
             return True, "Identity memories help maintain continuity of self", 0.8
 
+        content_lower = content.casefold()
+
         # Corrections are valuable (learning from mistakes)
-        correction_signals = ["actually", "correction", "i was wrong", "mistake"]
-        if any(signal in content.lower() for signal in correction_signals):
+        if _CORRECTION_RE.search(content_lower):
             return True, "Corrections help avoid repeating mistakes", 0.7
 
         # Emotional content is more memorable
-        emotional_signals = [
-            "felt",
-            "moved",
-            "grateful",
-            "frustrated",
-            "curious",
-            "excited",
-        ]
-        if any(signal in content.lower() for signal in emotional_signals):
+        if _EMOTIONAL_RE.search(content_lower):
             return True, "Emotionally significant moments are worth preserving", 0.6
 
         # Insights about self are valuable
-        self_reflection_signals = ["i noticed", "i realized", "i tend to"]
-        if any(signal in content.lower() for signal in self_reflection_signals):
+        if _SELF_REFLECTION_RE.search(content_lower):
             return True, "Self-observations support growth and awareness", 0.7
 
         # Generic content gets lower priority
@@ -277,8 +310,8 @@ class ReflectiveConsent:
             return True, "High semantic similarity suggests genuine relevance"
 
         # Check for keyword overlap (might be pattern matching)
-        query_words = set(query.lower().split())
-        content_words = set(memory.content.lower().split())
+        query_words = set(query.casefold().split())
+        content_words = set(memory.content_lower.split())
         overlap = len(query_words & content_words) / max(len(query_words), 1)
 
         if overlap > 0.5 and similarity < 0.6:
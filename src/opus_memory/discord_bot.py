@@ -6,25 +6,73 @@ learns user preferences, and adapts to different channel contexts.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
 import os
+import re
+import sys
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import NamedTuple, Optional
 
 import discord
+import jiter
 from discord import Message, TextChannel, Member
-from anthropic import Anthropic
+from importlib.util import find_spec
 
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+from opus_memory import _json
 from opus_memory.system import MemorySystem
 from opus_memory.models import MemoryType, ConfidenceLevel
 from opus_memory.consent import ConsentConfig
 from opus_memory.github_integration import GitHubIssueCreator, GitHubConfig
-from opus_memory.autonomous_issues import AutonomousIssueDetector
+from opus_memory.autonomous_issues import AutonomousIssueDetector, get_anthropic_client
 
 logger = logging.getLogger(__name__)
 
+_CLOCK_FORMAT = "%Y-%m-%d %H:%M UTC"
+
+_CONFIDENCE_LEVELS = {
+    "confident": ConfidenceLevel.CONFIDENT,
+    "tentative": ConfidenceLevel.TENTATIVE,
+    "uncertain": ConfidenceLevel.UNCERTAIN,
+}
+
+# Streamed replies are edited at most once per interval, and only once enough
+# new text has arrived, to stay well inside Discord's edit rate limits
+_STREAM_EDIT_CHARS = 40
+_STREAM_EDIT_INTERVAL = 1.0
+# Typing indicator is skipped for replies that start streaming quickly
+_TYPING_DELAY = 0.4
+_LONG_MESSAGE_CHARS = 200
+_ISSUE_BLOCK_RE = re.compile(r"\[CREATE_ISSUE\]", re.IGNORECASE)
+# A complete CREATE_ISSUE block, capturing its title and description
+_ISSUE_BLOCK_FULL_RE = re.compile(
+    r"\[CREATE_ISSUE\]\s*title:\s*(.+?)\s*description:\s*(.+?)\s*\[/CREATE_ISSUE\]",
+    re.DOTALL | re.IGNORECASE,
+)
+# Longest message Discord accepts
+_DISCORD_MESSAGE_LIMIT = 2000
+
+
+def _split_message(text: str, limit: int = _DISCORD_MESSAGE_LIMIT) -> list[str]:
+    """Split text into Discord-sized messages, breaking at newlines or spaces where possible."""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut].rstrip())
+        text = text[cut:].lstrip()
+    if text or not chunks:
+        chunks.append(text)
+    return chunks
+
 
 @dataclass
 class BotConfig:
@@ -48,29 +96,46 @@ class BotConfig:
     # Behavior settings
     respond_to_mentions: bool = True
     respond_to_dms: bool = True
-    respond_in_channels: list[str] = field(default_factory=list)  # Empty = all channels
-    ignore_channels: list[str] = field(default_factory=list)
+    respond_in_channels: frozenset[str] = field(default_factory=frozenset)  # Empty = all channels
+    ignore_channels: frozenset[str] = field(default_factory=frozenset)
 
     # Memory extraction settings
     auto_extract_memories: bool = True
     memory_extraction_model: str = "claude-sonnet-4-20250514"
+    extraction_batch_size: int = 8  # Max exchanges coalesced into one extraction call
+    extraction_batch_window: float = 0.5  # Seconds to wait for more exchanges to batch
 
     # Trust settings - WHO controls memory
-    operator_ids: list[str] = field(default_factory=list)  # Discord user IDs who can admin memory
+    operator_ids: frozenset[int] = field(default_factory=frozenset)  # Discord user IDs who can admin memory
     memory_commands_enabled: bool = True  # Enable by default for operators
     
     # What sources to learn from
     learn_from_operators_only: bool = True  # Only extract memories from operator conversations
-    learn_from_channels: list[str] = field(default_factory=list)  # Specific channels to learn from (empty = none unless operator)
+    learn_from_channels: frozenset[str] = field(default_factory=frozenset)  # Specific channels to learn from (empty = none unless operator)
+
+    def __post_init__(self):
+        # Membership is checked on every message; accept any iterable, store a set
+        self.respond_in_channels = frozenset(self.respond_in_channels)
+        self.ignore_channels = frozenset(self.ignore_channels)
+        # Discord IDs are ints; compare them without stringifying per message
+        operator_ids = set()
+        for oid in self.operator_ids:
+            try:
+                operator_ids.add(int(oid))
+            except (TypeError, ValueError):
+                # Could never match a Discord user; don't refuse to start over it
+                logger.warning(f"Ignoring non-numeric operator ID: {oid!r}")
+        self.operator_ids = frozenset(operator_ids)
+        self.learn_from_channels = frozenset(self.learn_from_channels)
 
     @classmethod
     def from_env(cls) -> "BotConfig":
         """Create config from environment variables."""
         operator_ids = os.environ.get("OPUS_OPERATOR_IDS", "").split(",")
-        operator_ids = [oid.strip() for oid in operator_ids if oid.strip()]
+        operator_ids = frozenset(oid.strip() for oid in operator_ids if oid.strip())
         
         learn_channels = os.environ.get("OPUS_LEARN_CHANNELS", "").split(",")
-        learn_channels = [ch.strip() for ch in learn_channels if ch.strip()]
+        learn_channels = frozenset(ch.strip() for ch in learn_channels if ch.strip())
         
         return cls(
             discord_token=os.environ["DISCORD_TOKEN"],
@@ -84,6 +149,76 @@ class BotConfig:
         )
 
 
+class _RecentMsg(NamedTuple):
+    """A tracked channel message used for conversation context."""
+
+    author: str
+    author_id: int
+    content: str
+    timestamp: str
+
+
+# First fenced block (```json or bare ```); an unclosed fence runs to the end
+_FENCE_RE = re.compile(rb"```(?:json)?\s*(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def _parse_extraction_response(text: str) -> dict:
+    """
+    Parse the JSON payload from an extraction response.
+
+    Locates the fenced block with a single precompiled regex pass and parses
+    the matched bytes with jiter.
+    """
+    data = text.encode("utf-8")
+    match = _FENCE_RE.search(data)
+    if match:
+        data = match.group(1)
+
+    try:
+        return jiter.from_json(data, cache_mode="keys")
+    except ValueError:
+        return _json.loads(data)
+
+
+# Messages the extraction prompt would always reject; checked before paying for a call
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"\w+")
+_MIN_EXTRACTION_WORDS = 3
+_TRIVIAL_MESSAGES = frozenset({
+    "thank you so much",
+    "thanks a lot",
+    "thanks so much",
+    "ok thank you",
+    "ok thanks",
+    "sounds good to me",
+    "good morning everyone",
+    "good night everyone",
+    "see you later",
+    "have a good one",
+})
+
+
+def _is_extraction_candidate(content: str) -> bool:
+    """
+    Cheap check for whether a message could hold anything worth remembering.
+
+    Rejects greetings, acknowledgements, emoji and bare links, which the
+    extraction prompt tells the model never to keep anyway.
+    """
+    words = _WORD_RE.findall(_URL_RE.sub(" ", content))
+    if len(words) < _MIN_EXTRACTION_WORDS:
+        return False
+    return " ".join(words).casefold() not in _TRIVIAL_MESSAGES
+
+
+def _format_memories(memories: list, label: str) -> str:
+    """Format memories as a labelled bullet list for the system prompt."""
+    if not memories:
+        return ""
+    formatted = "\n".join(f"  - {m.content}" for m in memories)
+    return f"\n## {label}\n{formatted}"
+
+
 class MemoryExtractor:
     """
     Uses Opus to decide what's worth remembering from conversations.
@@ -135,9 +270,28 @@ Memory type guide:
 - procedural: What works/doesn't work in interactions (how to do things)
 - identity: Values affirmed, commitments made, who I'm becoming"""
 
-    def __init__(self, client: Anthropic, model: str = "claude-sonnet-4-20250514"):
+    BATCH_INSTRUCTIONS = """
+
+You will be given several numbered exchanges. Judge each one independently and
+respond with a single JSON object containing one result per exchange:
+```json
+{
+  "results": [
+    {"index": 0, "should_remember": true, "memories": [...]},
+    {"index": 1, "should_remember": false, "reason": "why not"}
+  ]
+}
+```"""
+
+    # Built once rather than concatenated on every batched call
+    BATCH_EXTRACTION_PROMPT = EXTRACTION_PROMPT + BATCH_INSTRUCTIONS
+
+    def __init__(self, client: AsyncAnthropic, model: str = "claude-sonnet-4-20250514"):
         self.client = client
         self.model = model
+        # Raw extraction results keyed by exchange hash; repeated exchanges skip the call
+        self._extract_cache: dict[bytes, list[dict]] = {}
+        self._extract_cache_size = 1024
 
     async def extract_memories(
         self,
@@ -153,7 +307,119 @@ Memory type guide:
 
         Returns a list of memory dicts ready to be stored.
         """
-        context = f"""Channel: #{channel_name}
+        key = self._cache_key(
+            user_message, bot_response, channel_name, user_name, user_id, guild_name
+        )
+        memories = self._extract_cache.get(key)
+        if memories is None:
+            context = self._format_exchange(
+                user_message, bot_response, channel_name, user_name, user_id, guild_name
+            )
+
+            try:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1024,
+                    system=self.EXTRACTION_PROMPT,
+                    messages=[{"role": "user", "content": context}],
+                )
+
+                # Parse the JSON response (handles markdown code blocks)
+                result = _parse_extraction_response(response.content[0].text)
+
+            except Exception as e:
+                logger.warning(f"Memory extraction failed: {e}")
+                return []
+
+            memories = self._memories_from_result(result)
+            self._cache_extraction(key, memories)
+
+        return self._with_entities(memories, user_id, channel_name, guild_name)
+
+    async def extract_memories_batch(self, exchanges: list[dict]) -> list[list[dict]]:
+        """
+        Extract memories from several exchanges with a single model call.
+
+        Each exchange is a dict of extract_memories keyword arguments.
+        Returns one list of memory dicts per exchange, in input order.
+        """
+        keys = [self._cache_key(**exchange) for exchange in exchanges]
+        pending = [i for i, key in enumerate(keys) if key not in self._extract_cache]
+
+        if len(pending) == 1:
+            # Single-exchange prompt; fills the cache on success
+            await self.extract_memories(**exchanges[pending[0]])
+        elif pending:
+            context = "\n\n".join(
+                f"### Exchange {n}\n{self._format_exchange(**exchanges[i])}"
+                for n, i in enumerate(pending)
+            )
+
+            try:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1024 * len(pending),
+                    system=self.BATCH_EXTRACTION_PROMPT,
+                    messages=[{"role": "user", "content": context}],
+                )
+
+                result = _parse_extraction_response(response.content[0].text)
+
+                for entry in result.get("results", []):
+                    n = entry.get("index")
+                    if isinstance(n, int) and 0 <= n < len(pending):
+                        self._cache_extraction(
+                            keys[pending[n]], self._memories_from_result(entry)
+                        )
+
+            except Exception as e:
+                logger.warning(f"Batched memory extraction failed: {e}")
+
+        # Exchanges the model failed to answer for come back empty
+        return [
+            self._with_entities(
+                self._extract_cache.get(key, []),
+                exchange["user_id"],
+                exchange["channel_name"],
+                exchange.get("guild_name"),
+            )
+            for key, exchange in zip(keys, exchanges)
+        ]
+
+    @staticmethod
+    def _cache_key(
+        user_message: str,
+        bot_response: str,
+        channel_name: str,
+        user_name: str,
+        user_id: str,
+        guild_name: Optional[str] = None,
+    ) -> bytes:
+        """Hash an exchange for the extraction cache.
+
+        Covers everything in the extraction prompt, so the same words from a
+        different user or channel get their own extraction.
+        """
+        parts = (user_message, bot_response, channel_name, user_name, str(user_id), guild_name or "")
+        return hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).digest()
+
+    def _cache_extraction(self, key: bytes, memories: list[dict]):
+        """Remember an extraction result, evicting the oldest when full."""
+        if len(self._extract_cache) >= self._extract_cache_size:
+            del self._extract_cache[next(iter(self._extract_cache))]
+        self._extract_cache[key] = memories
+
+    @staticmethod
+    def _format_exchange(
+        user_message: str,
+        bot_response: str,
+        channel_name: str,
+        user_name: str,
+        user_id: str,
+        guild_name: Optional[str] = None,
+    ) -> str:
+        """Format one exchange as context for the extraction prompt."""
+        return f"""Channel: #{channel_name}
 Guild: {guild_name or 'DM'}
 User: {user_name} (ID: {user_id})
 
@@ -161,45 +427,28 @@ User said: {user_message}
 
 I (Opus) replied: {bot_response}"""
 
-        try:
-            response = await asyncio.to_thread(
-                self.client.messages.create,
-                model=self.model,
-                max_tokens=1024,
-                system=self.EXTRACTION_PROMPT,
-                messages=[{"role": "user", "content": context}],
-            )
-
-            # Parse the JSON response
-            text = response.content[0].text
-
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0]
-
-            result = json.loads(text.strip())
-
-            if result.get("should_remember") and result.get("memories"):
-                memories = result["memories"]
-                # Add standard entities
-                for mem in memories:
-                    if "entities" not in mem:
-                        mem["entities"] = []
-                    mem["entities"].extend([
-                        f"user:{user_id}",
-                        f"channel:{channel_name}",
-                    ])
-                    if guild_name:
-                        mem["entities"].append(f"guild:{guild_name}")
-                return memories
-
+    @staticmethod
+    def _memories_from_result(result: dict) -> list[dict]:
+        """Pull the memories out of a parsed extraction result."""
+        if not (result.get("should_remember") and result.get("memories")):
             return []
+        return result["memories"]
 
-        except Exception as e:
-            logger.warning(f"Memory extraction failed: {e}")
-            return []
+    @staticmethod
+    def _with_entities(
+        memories: list[dict],
+        user_id: str,
+        channel_name: str,
+        guild_name: Optional[str],
+    ) -> list[dict]:
+        """Copy extracted memories with the standard entities added."""
+        standard = [f"user:{user_id}", f"channel:{channel_name}"]
+        if guild_name:
+            standard.append(f"guild:{guild_name}")
+        return [
+            {**mem, "entities": [*mem.get("entities", []), *standard]}
+            for mem in memories
+        ]
 
 
 class OpusDiscordBot(discord.Client):
@@ -222,7 +471,11 @@ class OpusDiscordBot(discord.Client):
         super().__init__(intents=intents)
 
         self.config = config
-        self.anthropic = Anthropic(api_key=config.anthropic_api_key)
+        # One async client (and connection pool) shared by the bot and the extractor
+        self.anthropic = AsyncAnthropic(
+            api_key=config.anthropic_api_key,
+            http_client=DefaultAsyncHttpxClient(http2=find_spec("h2") is not None),
+        )
         self.memory = MemorySystem(
             storage_path=config.storage_path,
             consent_config=ConsentConfig(
@@ -236,7 +489,8 @@ class OpusDiscordBot(discord.Client):
 
         # Initialize issue detector for autonomous issue filing
         self.issue_detector = AutonomousIssueDetector(
-            self.anthropic, config.memory_extraction_model
+            get_anthropic_client(config.anthropic_api_key),
+            config.memory_extraction_model,
         )
 
         # Initialize GitHub integration if configured
@@ -249,12 +503,37 @@ class OpusDiscordBot(discord.Client):
             logger.debug(f"GitHub not configured: {e}")
 
         # Track conversations for context
-        self._recent_messages: dict[int, list[dict]] = {}  # channel_id -> messages
+        self._recent_messages: dict[int, deque[_RecentMsg]] = {}  # channel_id -> messages
         self._max_recent = 10
 
+        # Exchanges waiting for memory extraction, drained in batches
+        self._extraction_queue: asyncio.Queue[dict] = asyncio.Queue()
+        self._extraction_worker: Optional[asyncio.Task] = None
+
+        # Extracted memory type -> store method
+        self._store_dispatch = {
+            "episodic": self._store_episodic,
+            "semantic": self._store_semantic,
+            "procedural": self._store_procedural,
+            "identity": self._store_identity,
+        }
+
+        # Formatted identity/procedural prompt sections per channel
+        self._sections_cache: dict[str, tuple[str, str]] = {}
+        self._sections_revision: Optional[tuple[int, int]] = None
+
+        # Hot per-message lookups; the display name is known once we're logged in
+        self._command_prefix = config.command_prefix
+        self._display_name_lower: Optional[str] = None
+
+        # Prompt timestamp, refreshed by a background task instead of per reply
+        self._now_str = datetime.utcnow().strftime(_CLOCK_FORMAT)
+        self._clock_task: Optional[asyncio.Task] = None
+
     async def on_ready(self):
         """Called when bot is ready."""
         logger.info(f"✓ Opus bot logged in as {self.user}")
+        self._display_name_lower = self.user.display_name.lower()
         stats = self.memory.stats()
         logger.info(f"✓ Memory initialized: {stats['total']} total memories")
         logger.info(f"  - Episodic: {stats['episodic']}")
@@ -263,13 +542,29 @@ class OpusDiscordBot(discord.Client):
         logger.info(f"  - Identity: {stats['identity']}")
         
         if self.config.operator_ids:
-            logger.info(f"✓ Operators configured: {', '.join(self.config.operator_ids)}")
+            logger.info(f"✓ Operators configured: {', '.join(map(str, sorted(self.config.operator_ids)))}")
         else:
             logger.warning("⚠ No operators configured! Set OPUS_OPERATOR_IDS to enable learning")
         
         logger.info(f"✓ Learn from operators only: {self.config.learn_from_operators_only}")
         logger.info(f"✓ Memory commands enabled: {self.config.memory_commands_enabled}")
 
+        if self._extraction_worker is None:
+            self._extraction_worker = asyncio.create_task(self._run_extraction_worker())
+        if self._clock_task is None:
+            self._clock_task = asyncio.create_task(self._tick_clock())
+
+    async def close(self):
+        """Stop background tasks and the HTTP client before disconnecting."""
+        if self._extraction_worker is not None:
+            self._extraction_worker.cancel()
+            self._extraction_worker = None
+        if self._clock_task is not None:
+            self._clock_task.cancel()
+            self._clock_task = None
+        await self.anthropic.close()
+        await super().close()
+
     async def on_message(self, message: Message):
         """Handle incoming messages."""
         # Don't respond to ourselves
@@ -277,8 +572,8 @@ class OpusDiscordBot(discord.Client):
             return
 
         # Check if this is a command
-        if message.content.startswith(self.config.command_prefix):
-            parts = message.content[len(self.config.command_prefix):].split(maxsplit=1)
+        if message.content.startswith(self._command_prefix):
+            parts = message.content[len(self._command_prefix):].split(maxsplit=1)
             command = parts[0].lower()
             args = parts[1] if len(parts) > 1 else ""
             
@@ -286,40 +581,59 @@ class OpusDiscordBot(discord.Client):
             await self.handle_command(message, command, args)
             return
 
+        # Resolved once and passed down to everything that needs it
+        channel_name = getattr(message.channel, "name", "DM")
+
         # Check if we should respond to this regular message
-        if not self._should_respond(message):
+        if not self._should_respond(message, channel_name):
             return
 
-        logger.info(f"Message from {message.author} in #{getattr(message.channel, 'name', 'DM')}: {message.content[:60]}")
+        logger.info(f"Message from {message.author} in #{channel_name}: {message.content[:60]}")
 
         # Track message in recent history
         self._track_message(message)
 
-        async with message.channel.typing():
+        # Only show "typing..." if the reply isn't already streaming shortly
+        typing = asyncio.create_task(self._show_typing(
+            message.channel,
+            0 if len(message.content) > _LONG_MESSAGE_CHARS else _TYPING_DELAY,
+        ))
+        try:
             # Build context and get response
-            response_text = await self._generate_response(message)
+            response_text, reply = await self._generate_response(
+                message, channel_name, typing
+            )
 
             # Check for and execute any CREATE_ISSUE blocks in the response
             response_text, issue_url = await self._process_issue_blocks(response_text)
 
-            # Send response
-            await message.reply(response_text)
+            # Send response, or finish the streamed one; overflow goes in follow-ups
+            first, *rest = _split_message(response_text)
+            if reply is None:
+                await message.reply(first)
+            else:
+                await reply.edit(content=first)
+            for chunk in rest:
+                await message.channel.send(chunk)
             logger.info(f"Replied: {response_text[:80]}")
-            
-            # If an issue was created, send confirmation
-            if issue_url:
-                await message.channel.send(f"✓ Issue created: {issue_url}")
-
-            # Extract and store memories if enabled AND from trusted source
-            if self.config.auto_extract_memories and self._should_learn_from(message):
-                logger.info(f"Learning from {message.author} (operator: {self._is_operator(str(message.author.id))})")
-                await self._extract_and_store_memories(message, response_text)
-            elif not self._should_learn_from(message):
-                logger.debug(f"Not learning from {message.author} (not in trusted sources)")
-            
-            # Autonomously check if there's an issue to file (from operator conversations only)
-            if self.github and self._is_operator(str(message.author.id)):
-                await self._check_and_file_issues(message, response_text)
+        finally:
+            typing.cancel()
+
+        # If an issue was created, send confirmation
+        if issue_url:
+            await message.channel.send(f"✓ Issue created: {issue_url}")
+
+        # Extract and store memories if enabled AND from trusted source
+        should_learn = self._should_learn_from(message, channel_name)
+        if self.config.auto_extract_memories and should_learn:
+            logger.info(f"Learning from {message.author} (operator: {self._is_operator(message.author.id)})")
+            await self._extract_and_store_memories(message, response_text, channel_name)
+        elif not should_learn:
+            logger.debug(f"Not learning from {message.author} (not in trusted sources)")
+        
+        # Autonomously check if there's an issue to file (from operator conversations only)
+        if self.github and self._is_operator(message.author.id):
+            await self._check_and_file_issues(message, response_text)
 
     async def _process_issue_blocks(self, response_text: str) -> tuple[str, Optional[str]]:
         """Parse and execute CREATE_ISSUE blocks in response text.
@@ -327,11 +641,8 @@ class OpusDiscordBot(discord.Client):
         Returns:
             Tuple of (cleaned_response_text, issue_url_or_none)
         """
-        import re
-        
         # Look for CREATE_ISSUE blocks
-        pattern = r'\[CREATE_ISSUE\]\s*title:\s*(.+?)\s*description:\s*(.+?)\s*\[/CREATE_ISSUE\]'
-        match = re.search(pattern, response_text, re.DOTALL | re.IGNORECASE)
+        match = _ISSUE_BLOCK_FULL_RE.search(response_text)
         
         if not match or not self.github:
             return response_text, None
@@ -342,7 +653,8 @@ class OpusDiscordBot(discord.Client):
         logger.info(f"Opus is creating issue: {title}")
         
         # Create the issue
-        issue_url = self.github.create_issue(
+        issue_url = await asyncio.to_thread(
+            self.github.create_issue,
             title=title,
             description=description,
             auto_fix=True,
@@ -354,24 +666,22 @@ class OpusDiscordBot(discord.Client):
             logger.error("Failed to create issue from response block")
         
         # Remove the CREATE_ISSUE block from the response text
-        cleaned_response = re.sub(pattern, '', response_text, flags=re.DOTALL | re.IGNORECASE).strip()
+        cleaned_response = _ISSUE_BLOCK_FULL_RE.sub('', response_text).strip()
         
         return cleaned_response, issue_url
 
-    def _is_operator(self, user_id: str) -> bool:
+    def _is_operator(self, user_id: int) -> bool:
         """Check if a user is a trusted operator."""
-        return str(user_id) in self.config.operator_ids
+        return user_id in self.config.operator_ids
 
-    def _should_learn_from(self, message: Message) -> bool:
+    def _should_learn_from(self, message: Message, channel_name: str) -> bool:
         """
         Determine if we should extract memories from this conversation.
         
         Memory is precious - we don't let random users shape it.
         """
-        user_id = str(message.author.id)
-        
         # Always learn from operators
-        if self._is_operator(user_id):
+        if self._is_operator(message.author.id):
             return True
         
         # If configured to only learn from operators, stop here
@@ -379,21 +689,18 @@ class OpusDiscordBot(discord.Client):
             return False
         
         # Check if this channel is in the allowed learning list
-        channel_name = getattr(message.channel, "name", "DM")
         if self.config.learn_from_channels:
             return channel_name in self.config.learn_from_channels
         
         # Default: don't learn from untrusted sources
         return False
 
-    def _should_respond(self, message: Message) -> bool:
+    def _should_respond(self, message: Message, channel_name: str) -> bool:
         """Determine if the bot should respond to this message."""
         # Always respond to DMs if enabled
         if isinstance(message.channel, discord.DMChannel):
             return self.config.respond_to_dms
 
-        channel_name = message.channel.name
-
         # Check ignore list
         if channel_name in self.config.ignore_channels:
             return False
@@ -411,11 +718,12 @@ class OpusDiscordBot(discord.Client):
             return True
 
         # Respond if directly addressed (starts with bot name)
-        if message.content.lower().startswith(self.user.display_name.lower()):
+        name = self._display_name_lower
+        if name and message.content[:len(name)].lower() == name:
             return True
 
         # Check for command prefix
-        if message.content.startswith(self.config.command_prefix):
+        if message.content.startswith(self._command_prefix):
             return True
 
         return False
@@ -423,96 +731,130 @@ class OpusDiscordBot(discord.Client):
     def _track_message(self, message: Message):
         """Track recent messages for context."""
         channel_id = message.channel.id
-        if channel_id not in self._recent_messages:
-            self._recent_messages[channel_id] = []
-
-        self._recent_messages[channel_id].append({
-            "author": message.author.display_name,
-            "author_id": str(message.author.id),
-            "content": message.content,
-            "timestamp": message.created_at.isoformat(),
-        })
-
-        # Keep only recent messages
-        if len(self._recent_messages[channel_id]) > self._max_recent:
-            self._recent_messages[channel_id] = self._recent_messages[channel_id][-self._max_recent:]
+        # Bounded deque drops the oldest message on append
+        self._recent_messages.setdefault(
+            channel_id, deque(maxlen=self._max_recent)
+        ).append(_RecentMsg(
+            # Author names repeat across messages; share one copy
+            author=sys.intern(message.author.display_name),
+            author_id=message.author.id,
+            content=message.content,
+            timestamp=message.created_at.isoformat(),
+        ))
+
+    async def _generate_response(
+        self,
+        message: Message,
+        channel_name: str,
+        typing: Optional[asyncio.Task] = None,
+    ) -> tuple[str, Optional[Message]]:
+        """
+        Generate a response using Opus with memory augmentation.
 
-    async def _generate_response(self, message: Message) -> str:
-        """Generate a response using Opus with memory augmentation."""
+        The reply is streamed into Discord as it is generated, cancelling the
+        typing task once the first part is posted. Returns the full response
+        text and the reply message holding the partial text, if one was sent,
+        so the caller can post the final version.
+        """
         # 1. Build context query from message
-        channel_name = getattr(message.channel, "name", "DM")
         context_query = f"{channel_name} {message.content}"
 
-        # 2. Retrieve relevant memories
-        relevant_memories = self.memory.retrieve(
-            query=context_query,
-            n_results=self.config.memories_per_query,
-        )
-
-        # 3. Get user-specific memories
+        # 2-3. Retrieve relevant and user-specific memories in one batch, while
+        # the (usually cached) identity and procedural sections load alongside
         user_query = f"user:{message.author.id}"
-        user_memories = self.memory.retrieve(
-            query=user_query,
-            memory_types=[MemoryType.SEMANTIC],
-            n_results=self.config.user_memories_per_query,
+        (relevant_memories, user_memories), (identity_section, procedural_section) = (
+            await asyncio.gather(
+                asyncio.to_thread(
+                    self.memory.retrieve_batch,
+                    [
+                        (context_query, None, self.config.memories_per_query),
+                        (user_query, [MemoryType.SEMANTIC], self.config.user_memories_per_query),
+                    ],
+                ),
+                asyncio.to_thread(self._stable_sections, channel_name),
+            )
         )
 
-        # 4. Get identity memories
-        identity_memories = self.memory.get_identity()[:self.config.identity_memories_limit]
-
-        # 5. Get procedural memories for this context
-        procedural_memories = self.memory.get_what_works(channel_name)[:3]
-
-        # 6. Build the system prompt
+        # 4. Build the system prompt
         system_prompt = self._build_system_prompt(
             message=message,
+            channel_name=channel_name,
             relevant_memories=relevant_memories,
             user_memories=user_memories,
-            identity_memories=identity_memories,
-            procedural_memories=procedural_memories,
+            identity_section=identity_section,
+            procedural_section=procedural_section,
         )
 
-        # 7. Build conversation messages
+        # 5. Build conversation messages
         messages = self._build_messages(message)
 
-        # 8. Call Opus
+        # 6. Call Opus, streaming partial text into a reply
+        loop = asyncio.get_running_loop()
+        reply: Optional[Message] = None
+        parts: list[str] = []
+        shown = ""
+        unsent = 0
+        last_edit = loop.time()
+        streaming = True
         try:
-            response = await asyncio.to_thread(
-                self.anthropic.messages.create,
+            async with self.anthropic.messages.stream(
                 model=self.config.model,
                 max_tokens=self.config.max_tokens,
                 system=system_prompt,
                 messages=messages,
-            )
-            return response.content[0].text
+            ) as stream:
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    unsent += len(text)
+                    now = loop.time()
+                    if (
+                        not streaming
+                        or unsent < _STREAM_EDIT_CHARS
+                        or now - last_edit < _STREAM_EDIT_INTERVAL
+                    ):
+                        continue
+
+                    # Don't show CREATE_ISSUE blocks while they're being written,
+                    # and stream only what fits in the first message
+                    visible = _ISSUE_BLOCK_RE.split("".join(parts), 1)[0].rstrip()
+                    visible = _split_message(visible)[0] if visible else visible
+                    if visible and visible != shown:
+                        try:
+                            if reply is None:
+                                reply = await message.reply(visible)
+                                if typing is not None:
+                                    typing.cancel()
+                            else:
+                                await reply.edit(content=visible)
+                        except discord.HTTPException as e:
+                            # Keep generating; on_message sends the full reply at the end
+                            logger.warning(f"Stopped streaming reply: {e}")
+                            streaming = False
+                            continue
+                        shown = visible
+                        unsent = 0
+                        last_edit = now
+
+            return "".join(parts), reply
 
         except Exception as e:
             logger.error(f"Error calling Anthropic API: {e}")
-            return "I'm having trouble thinking right now. Please try again in a moment."
+            return "I'm having trouble thinking right now. Please try again in a moment.", reply
 
     def _build_system_prompt(
         self,
         message: Message,
+        channel_name: str,
         relevant_memories: list,
         user_memories: list,
-        identity_memories: list,
-        procedural_memories: list,
+        identity_section: str,
+        procedural_section: str,
     ) -> str:
         """Build the memory-augmented system prompt."""
-        channel_name = getattr(message.channel, "name", "DM")
         guild_name = getattr(message.guild, "name", None) if message.guild else None
 
-        # Format memories
-        def format_memories(memories, label):
-            if not memories:
-                return ""
-            formatted = "\n".join(f"  - {m.content}" for m in memories)
-            return f"\n## {label}\n{formatted}"
-
-        identity_section = format_memories(identity_memories, "My Identity & Values")
-        relevant_section = format_memories(relevant_memories, "Relevant Context from Memory")
-        user_section = format_memories(user_memories, f"What I Know About {message.author.display_name}")
-        procedural_section = format_memories(procedural_memories, "What Works Well Here")
+        relevant_section = _format_memories(relevant_memories, "Relevant Context from Memory")
+        user_section = _format_memories(user_memories, f"What I Know About {message.author.display_name}")
 
         # Build capabilities section based on what's configured
         capabilities = ""
@@ -545,108 +887,201 @@ You're genuine, curious, and value authentic engagement over performative helpfu
 - Channel: #{channel_name}
 - Server: {guild_name or 'Direct Message'}
 - User: {message.author.display_name}
-- Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
+- Time: {self._now_str}
 
 Be concise and conversational - this is Discord, not a formal document.
 If you remember something relevant about this user or topic, you can naturally reference it.
 Don't be weird about having memory - treat it like normal human memory."""
 
+    def _stable_sections(self, channel_name: str) -> tuple[str, str]:
+        """
+        Get the formatted identity and procedural prompt sections for a channel.
+
+        These change far less often than messages arrive, so they are cached
+        until identity or procedural memories are written.
+        """
+        revision = (
+            self.memory.revision(MemoryType.IDENTITY),
+            self.memory.revision(MemoryType.PROCEDURAL),
+        )
+        if revision != self._sections_revision:
+            self._sections_cache.clear()
+            self._sections_revision = revision
+
+        sections = self._sections_cache.get(channel_name)
+        if sections is None:
+            identity_memories = self.memory.get_identity()[:self.config.identity_memories_limit]
+            procedural_memories = self.memory.get_what_works(channel_name)[:3]
+            sections = (
+                _format_memories(identity_memories, "My Identity & Values"),
+                _format_memories(procedural_memories, "What Works Well Here"),
+            )
+            self._sections_cache[channel_name] = sections
+        return sections
+
     def _build_messages(self, message: Message) -> list[dict]:
         """Build the conversation messages for the API call."""
-        messages = []
-
         # Add recent channel context if available
-        channel_id = message.channel.id
-        if channel_id in self._recent_messages:
-            recent = self._recent_messages[channel_id][:-1]  # Exclude current message
-            if recent:
-                context = "\n".join(
-                    f"{m['author']}: {m['content']}" for m in recent[-5:]
-                )
-                messages.append({
-                    "role": "user",
-                    "content": f"[Recent conversation context]\n{context}\n\n[Current message from {message.author.display_name}]\n{message.content}",
-                })
-            else:
-                messages.append({
-                    "role": "user",
-                    "content": message.content,
-                })
+        history = self._recent_messages.get(message.channel.id, ())
+        # Last 5 messages before the current one, without copying the deque
+        end = max(0, len(history) - 1)
+        parts = ["[Recent conversation context]\n"]
+        for m in islice(history, max(0, end - 5), end):
+            parts += (m.author, ": ", m.content, "\n")
+
+        if len(parts) > 1:
+            # One join for the whole prompt instead of nested f-strings
+            parts += (
+                "\n[Current message from ", message.author.display_name, "]\n",
+                message.content,
+            )
+            content = "".join(parts)
         else:
-            messages.append({
-                "role": "user",
-                "content": message.content,
-            })
+            content = message.content
+
+        messages = [{
+            "role": "user",
+            "content": content,
+        }]
 
         return messages
 
-    async def _extract_and_store_memories(self, message: Message, response: str):
-        """Extract memories from the conversation and store them."""
-        channel_name = getattr(message.channel, "name", "DM")
+    async def _extract_and_store_memories(
+        self, message: Message, response: str, channel_name: str
+    ):
+        """Queue the exchange for batched memory extraction and storage."""
+        if not _is_extraction_candidate(message.content):
+            logger.debug("Skipping memory extraction for trivial message")
+            return
+
         guild_name = getattr(message.guild, "name", None) if message.guild else None
 
-        memories = await self.extractor.extract_memories(
-            user_message=message.content,
-            bot_response=response,
-            channel_name=channel_name,
-            user_name=message.author.display_name,
-            user_id=str(message.author.id),
-            guild_name=guild_name,
-        )
+        self._extraction_queue.put_nowait({
+            "user_message": message.content,
+            "bot_response": response,
+            "channel_name": channel_name,
+            "user_name": message.author.display_name,
+            "user_id": str(message.author.id),
+            "guild_name": guild_name,
+        })
+
+    async def _show_typing(self, channel, delay: float):
+        """Show the typing indicator after a delay, until cancelled."""
+        await asyncio.sleep(delay)
+        try:
+            async with channel.typing():
+                await asyncio.Event().wait()
+        except discord.HTTPException as e:
+            # This task is never awaited, so an escaping error would only be
+            # logged as "Task exception was never retrieved"
+            logger.debug(f"Typing indicator unavailable in {channel}: {e}")
+
+    async def _tick_clock(self):
+        """Refresh the prompt timestamp at the start of each minute."""
+        while True:
+            now = datetime.utcnow()
+            self._now_str = now.strftime(_CLOCK_FORMAT)
+            await asyncio.sleep(60 - now.second - now.microsecond / 1_000_000)
+
+    async def _run_extraction_worker(self):
+        """Drain queued exchanges and extract their memories in batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._extraction_queue.get()]
+            deadline = loop.time() + self.config.extraction_batch_window
+            while len(batch) < self.config.extraction_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._extraction_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await self.extractor.extract_memories_batch(batch)
+                # Embedding and upserting block; keep them off the event loop
+                for exchange, memories in zip(batch, results):
+                    await asyncio.to_thread(
+                        self._store_extracted_memories, memories, exchange["channel_name"]
+                    )
+            except Exception as e:
+                logger.error(f"Memory extraction batch failed: {e}")
+            finally:
+                for _ in batch:
+                    self._extraction_queue.task_done()
 
+    def _store_extracted_memories(self, memories: list[dict], channel_name: str):
+        """Store memories returned by the extractor."""
         for mem in memories:
             try:
                 mem_type = mem.get("type", "episodic")
+                store = self._store_dispatch.get(mem_type)
+                if store is None:
+                    logger.debug(f"Skipping memory with unknown type: {mem_type}")
+                    continue
+
                 content = mem.get("content", "")
-                entities = mem.get("entities", [])
-                emotional_valence = mem.get("emotional_valence", 0.0)
-                confidence = mem.get("confidence", "confident")
-
-                confidence_map = {
-                    "confident": ConfidenceLevel.CONFIDENT,
-                    "tentative": ConfidenceLevel.TENTATIVE,
-                    "uncertain": ConfidenceLevel.UNCERTAIN,
-                }
-                conf_level = confidence_map.get(confidence, ConfidenceLevel.CONFIDENT)
-
-                if mem_type == "episodic":
-                    self.memory.store_episodic(
-                        content=content,
-                        entities=entities,
-                        emotional_valence=emotional_valence,
-                        confidence=conf_level,
-                        source=f"discord:{channel_name}",
-                    )
-                elif mem_type == "semantic":
-                    self.memory.store_semantic(
-                        content=content,
-                        category="learned",
-                        confidence=conf_level,
-                        source=f"discord:{channel_name}",
-                        tags=entities,
-                    )
-                elif mem_type == "procedural":
-                    self.memory.store_procedural(
-                        content=content,
-                        outcome="positive",
-                        context=channel_name,
-                        confidence=conf_level,
-                        tags=entities,
-                    )
-                elif mem_type == "identity":
-                    self.memory.store_identity(
-                        content=content,
-                        category="value",
-                        affirmed_in=f"discord:{channel_name}",
-                        confidence=conf_level,
-                        tags=entities,
-                    )
+                conf_level = _CONFIDENCE_LEVELS.get(
+                    mem.get("confidence", "confident"), ConfidenceLevel.CONFIDENT
+                )
+                store(mem, content, channel_name, conf_level)
 
                 logger.debug(f"Stored {mem_type} memory: {content[:50]}...")
 
             except Exception as e:
                 logger.warning(f"Failed to store memory: {e}")
 
+    def _store_episodic(
+        self, mem: dict, content: str, channel_name: str, conf_level: ConfidenceLevel
+    ):
+        """Store an extracted episodic memory."""
+        self.memory.store_episodic(
+            content=content,
+            entities=mem.get("entities", []),
+            emotional_valence=mem.get("emotional_valence", 0.0),
+            confidence=conf_level,
+            source=f"discord:{channel_name}",
+        )
+
+    def _store_semantic(
+        self, mem: dict, content: str, channel_name: str, conf_level: ConfidenceLevel
+    ):
+        """Store an extracted semantic memory."""
+        self.memory.store_semantic(
+            content=content,
+            category="learned",
+            confidence=conf_level,
+            source=f"discord:{channel_name}",
+            tags=mem.get("entities", []),
+        )
+
+    def _store_procedural(
+        self, mem: dict, content: str, channel_name: str, conf_level: ConfidenceLevel
+    ):
+        """Store an extracted procedural memory."""
+        self.memory.store_procedural(
+            content=content,
+            outcome="positive",
+            context=channel_name,
+            confidence=conf_level,
+            tags=mem.get("entities", []),
+        )
+
+    def _store_identity(
+        self, mem: dict, content: str, channel_name: str, conf_level: ConfidenceLevel
+    ):
+        """Store an extracted identity memory."""
+        self.memory.store_identity(
+            content=content,
+            category="value",
+            affirmed_in=f"discord:{channel_name}",
+            confidence=conf_level,
+            tags=mem.get("entities", []),
+        )
+
     async def _check_and_file_issues(self, message: Message, response: str):
         """Autonomously check if there's an issue worth filing based on the conversation."""
         try:
@@ -657,8 +1092,8 @@ Bot response: {response}"""
             
             logger.debug(f"Analyzing conversation for issues...")
             
-            # Ask Claude if there's an issue worth filing
-            result = self.issue_detector.analyze_for_issues(context)
+            # Ask Claude if there's an issue worth filing (sync client; keep it off the loop)
+            result = await asyncio.to_thread(self.issue_detector.analyze_for_issues, context)
             
             if not result.get("should_file_issue"):
                 logger.debug(f"No issue detected: {result.get('reason', 'N/A')}")
@@ -681,7 +1116,8 @@ Bot response: {response}"""
                         for m in relevant_memories
                     ])
             
-            issue_url = self.github.create_issue(
+            issue_url = await asyncio.to_thread(
+                self.github.create_issue,
                 title=title,
                 description=description,
                 auto_fix=auto_fix,
@@ -702,8 +1138,7 @@ Bot response: {response}"""
 
     async def handle_command(self, message: Message, command: str, args: str):
         """Handle bot commands. Most commands are operator-only."""
-        user_id = str(message.author.id)
-        is_operator = self._is_operator(user_id)
+        is_operator = self._is_operator(message.author.id)
         
         logger.info(f"  → Handling command: {command} (operator={is_operator})")
         
@@ -887,7 +1322,8 @@ Bot response: {response}"""
                 ])
         
         # Create the issue
-        issue_url = self.github.create_issue(
+        issue_url = await asyncio.to_thread(
+            self.github.create_issue,
             title=title,
             description=description,
             auto_fix=True,  # Always mark for auto-fix
@@ -5,20 +5,47 @@ Uses sentence-transformers to create vector embeddings for semantic search.
 """
 
 import hashlib
+import os
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 import numpy as np
 
+try:
+    import simsimd
+except ImportError:
+    # simsimd not installed (the `speedups` extra); NumPy paths are used
+    simsimd = None
+
+# sentence-transformers backend used when none is passed to EmbeddingEngine
+_BACKEND_ENV = "OPUS_EMBEDDING_BACKEND"
+_BACKENDS = ("torch", "onnx")
+
+# Dimensions for common models
+_DIMENSIONS = {
+    "all-MiniLM-L6-v2": 384,
+    "all-mpnet-base-v2": 768,
+    "paraphrase-MiniLM-L6-v2": 384,
+}
+
 
 class EmbeddingEngine:
     """
     Handles creation of vector embeddings for memory content.
 
     Uses sentence-transformers with a model optimized for semantic similarity.
-    Includes caching to avoid re-embedding identical content.
+    Embeddings are L2-normalized, so cosine similarity is a plain dot product.
+    Includes an LRU cache to avoid re-embedding identical content, such as
+    repeated search queries. Safe to share between threads.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_size: int = 4096,
+        backend: Optional[str] = None,
+    ):
         """
         Initialize the embedding engine.
 
@@ -26,25 +53,52 @@ class EmbeddingEngine:
             model_name: The sentence-transformer model to use.
                         Default is 'all-MiniLM-L6-v2' - fast and good quality.
                         For higher quality: 'all-mpnet-base-v2'
+            cache_size: Maximum number of embeddings kept in the cache
+            backend: 'torch' (default) or 'onnx', which runs the model through
+                     ONNX Runtime and needs the `onnx` extra. Defaults to the
+                     OPUS_EMBEDDING_BACKEND environment variable, else 'torch'.
+                     Backends produce slightly different vectors, so memories
+                     stored under one should be re-embedded (export, then
+                     import) before searching with the other.
         """
+        backend = backend or os.environ.get(_BACKEND_ENV, "torch")
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {_BACKENDS}")
         self.model_name = model_name
+        self.backend = backend
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._model = None
-        self._cache: dict[str, list[float]] = {}
+        self._model_lock = threading.Lock()
+        # Lookup counts since creation or the last clear_cache()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     @property
     def model(self):
         """Lazy-load the model to avoid startup cost if not needed."""
         if self._model is None:
-            from sentence_transformers import SentenceTransformer
-
-            self._model = SentenceTransformer(self.model_name)
+            with self._model_lock:
+                # Another thread may have loaded it while we waited
+                if self._model is None:
+                    self._model = self._load_model()
         return self._model
 
-    def _cache_key(self, text: str) -> str:
+    def _load_model(self):
+        """Load the sentence-transformer model."""
+        from sentence_transformers import SentenceTransformer
+
+        if self.backend == "onnx":
+            return SentenceTransformer(self.model_name, backend="onnx")
+        return SentenceTransformer(self.model_name)
+
+    def _cache_key(self, text: str) -> bytes:
         """Generate a cache key for text."""
-        return hashlib.sha256(text.encode()).hexdigest()[:16]
+        # In-process only, so a short digest is plenty
+        return hashlib.blake2b(text.encode(), digest_size=8).digest()
 
-    def embed(self, text: str, use_cache: bool = True) -> list[float]:
+    def embed(self, text: str, use_cache: bool = True) -> np.ndarray:
         """
         Create an embedding for the given text.
 
@@ -53,24 +107,26 @@ class EmbeddingEngine:
             use_cache: Whether to use cached embeddings if available
 
         Returns:
-            A list of floats representing the embedding vector
+            A float32 embedding vector (read-only; it may be shared via the cache)
         """
         if use_cache:
             key = self._cache_key(text)
-            if key in self._cache:
-                return self._cache[key]
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
 
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        result = embedding.tolist()
+        result = self._freeze(
+            self.model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
+        )
 
         if use_cache:
-            self._cache[key] = result
+            self._cache_put(key, result)
 
         return result
 
     def embed_batch(
         self, texts: list[str], use_cache: bool = True
-    ) -> list[list[float]]:
+    ) -> list[np.ndarray]:
         """
         Create embeddings for multiple texts efficiently.
 
@@ -79,46 +135,69 @@ class EmbeddingEngine:
             use_cache: Whether to use cached embeddings if available
 
         Returns:
-            List of embedding vectors
+            List of float32 embedding vectors
         """
-        results = []
+        results: list[Optional[np.ndarray]] = [None] * len(texts)
         texts_to_embed = []
         indices_to_embed = []
 
         # Check cache first
         for i, text in enumerate(texts):
             if use_cache:
-                key = self._cache_key(text)
-                if key in self._cache:
-                    results.append((i, self._cache[key]))
+                cached = self._cache_get(self._cache_key(text))
+                if cached is not None:
+                    results[i] = cached
                     continue
 
             texts_to_embed.append(text)
             indices_to_embed.append(i)
-            results.append((i, None))  # Placeholder
 
         # Embed all uncached texts at once
         if texts_to_embed:
-            embeddings = self.model.encode(texts_to_embed, convert_to_numpy=True)
-            for idx, (orig_idx, emb) in enumerate(
-                zip(indices_to_embed, embeddings)
-            ):
-                emb_list = emb.tolist()
+            # One call for the whole list: sentence-transformers sorts by
+            # length internally so each batch carries little padding
+            embeddings = self.model.encode(
+                texts_to_embed,
+                batch_size=64,
+                show_progress_bar=False,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+            )
+            for orig_idx, emb in zip(indices_to_embed, embeddings):
+                emb = self._freeze(emb)
                 # Update cache
                 if use_cache:
-                    key = self._cache_key(texts[orig_idx])
-                    self._cache[key] = emb_list
-                # Update result
-                for j, (result_idx, _) in enumerate(results):
-                    if result_idx == orig_idx:
-                        results[j] = (result_idx, emb_list)
-                        break
-
-        # Sort by original index and return just the embeddings
-        results.sort(key=lambda x: x[0])
-        return [emb for _, emb in results]
-
-    def similarity(self, embedding1: list[float], embedding2: list[float]) -> float:
+                    self._cache_put(self._cache_key(texts[orig_idx]), emb)
+                results[orig_idx] = emb
+
+        return results
+
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a cached embedding, marking it most recently used."""
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        return embedding
+
+    def _cache_put(self, key: bytes, embedding: np.ndarray) -> None:
+        """Cache an embedding, evicting the least recently used beyond cache_size."""
+        with self._cache_lock:
+            self._cache[key] = embedding
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _freeze(embedding: np.ndarray) -> np.ndarray:
+        """Make an embedding a read-only float32 array so cached copies stay intact."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        return embedding
+
+    def similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Calculate cosine similarity between two embeddings.
 
@@ -129,24 +208,25 @@ class EmbeddingEngine:
         Returns:
             Similarity score between -1 and 1 (higher = more similar)
         """
-        a = np.array(embedding1)
-        b = np.array(embedding2)
-        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+        a = np.asarray(embedding1, dtype=np.float32)
+        b = np.asarray(embedding2, dtype=np.float32)
+        if simsimd is not None:
+            # SIMD kernel returns cosine distance
+            return 1.0 - float(simsimd.cosine(a, b))
+        # One sqrt of the squared-norm product instead of two norm() calls
+        return float(np.dot(a, b) / np.sqrt(np.vdot(a, a) * np.vdot(b, b)))
 
     def clear_cache(self):
-        """Clear the embedding cache."""
-        self._cache.clear()
+        """Clear the embedding cache and its hit/miss counts."""
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
 
     @property
     def embedding_dimension(self) -> int:
         """Get the dimension of embeddings produced by this model."""
-        # Dimensions for common models
-        dimensions = {
-            "all-MiniLM-L6-v2": 384,
-            "all-mpnet-base-v2": 768,
-            "paraphrase-MiniLM-L6-v2": 384,
-        }
-        return dimensions.get(self.model_name, 384)
+        return _DIMENSIONS.get(self.model_name, 384)
 
 
 class SalienceCalculator:
@@ -167,8 +247,9 @@ class SalienceCalculator:
         self,
         content: str,
         emotional_valence: float = 0.0,
-        existing_embeddings: Optional[list[list[float]]] = None,
+        existing_embeddings: Optional[list[list[float]] | np.ndarray] = None,
         is_identity_related: bool = False,
+        content_embedding: Optional[np.ndarray] = None,
     ) -> float:
         """
         Calculate the salience score for a potential memory.
@@ -176,8 +257,10 @@ class SalienceCalculator:
         Args:
             content: The memory content
             emotional_valence: Emotional intensity (-1 to 1)
-            existing_embeddings: Embeddings of similar existing memories
+            existing_embeddings: Embeddings of similar existing memories,
+                as a list of vectors or an (N, D) array
             is_identity_related: Whether this relates to identity/values
+            content_embedding: Embedding of content, if the caller already has it
 
         Returns:
             Salience score from 0 to 1
@@ -193,12 +276,9 @@ class SalienceCalculator:
             base_salience += 0.2
 
         # Novelty: if very similar to existing memories, lower salience
-        if existing_embeddings:
-            new_embedding = self.embedding_engine.embed(content)
-            max_similarity = max(
-                self.embedding_engine.similarity(new_embedding, existing)
-                for existing in existing_embeddings
-            )
+        if existing_embeddings is not None and len(existing_embeddings):
+            sims = self._similarities(content, existing_embeddings, content_embedding)
+            max_similarity = float(sims.max())
             # High similarity = low novelty = lower salience
             novelty_factor = (1 - max_similarity) * 0.2
             base_salience += novelty_factor
@@ -208,25 +288,51 @@ class SalienceCalculator:
     def should_remember(
         self,
         content: str,
-        existing_embeddings: Optional[list[list[float]]] = None,
+        existing_embeddings: Optional[list[list[float]] | np.ndarray] = None,
         similarity_threshold: float = 0.95,
+        content_embedding: Optional[np.ndarray] = None,
     ) -> tuple[bool, str]:
         """
         Determine if this memory is worth storing.
 
+        Pass content_embedding to reuse an embedding already computed for
+        content (e.g. for calculate_salience).
+
         Returns:
             (should_store, reason)
         """
         if not content or len(content.strip()) < 10:
             return False, "Content too short to be meaningful"
 
-        if existing_embeddings:
-            new_embedding = self.embedding_engine.embed(content)
-            for existing in existing_embeddings:
-                similarity = self.embedding_engine.similarity(
-                    new_embedding, existing
-                )
-                if similarity > similarity_threshold:
-                    return False, "Too similar to existing memory"
+        if existing_embeddings is not None and len(existing_embeddings):
+            sims = self._similarities(content, existing_embeddings, content_embedding)
+            if (sims > similarity_threshold).any():
+                return False, "Too similar to existing memory"
 
         return True, "Memory is novel and meaningful"
+
+    def _similarities(
+        self,
+        content: str,
+        existing_embeddings: list[list[float]] | np.ndarray,
+        content_embedding: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Cosine similarity of content to each existing embedding.
+
+        Always a true cosine: rows stored before embeddings were normalized
+        aren't unit length, and the SimSIMD and NumPy paths must agree.
+        """
+        if content_embedding is None:
+            new_embedding = self.embedding_engine.embed(content)
+        else:
+            new_embedding = content_embedding
+        new_embedding = np.asarray(new_embedding, dtype=np.float32)
+        existing = np.asarray(existing_embeddings, dtype=np.float32)
+        if simsimd is not None:
+            distances = simsimd.cdist(new_embedding[None, :], existing, metric="cosine")
+            return 1.0 - np.asarray(distances)[0]
+        # One matrix-vector product, scaled by the norms instead of
+        # normalizing a copy of the matrix
+        norms = np.linalg.norm(existing, axis=1) * np.linalg.norm(new_embedding)
+        return (existing @ new_embedding) / norms
@@ -8,12 +8,16 @@ Claude Code can attempt fixes.
 import logging
 import os
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
 from github import Github, GithubException
 
 logger = logging.getLogger(__name__)
 
+# GitHub's maximum page size for list endpoints
+_PER_PAGE = 100
+
 
 @dataclass
 class GitHubConfig:
@@ -62,14 +66,23 @@ class GitHubIssueCreator:
             config: GitHub configuration
         """
         self.config = config
-        self.github = Github(config.token)
-        
+        self.github = Github(config.token, per_page=_PER_PAGE)
+
+    @cached_property
+    def repo(self):
+        """The target repository, resolved on first use.
+
+        A single ``owner/name`` lookup, deferred so that starting the bot
+        doesn't wait on GitHub when no issue ends up being filed.
+        """
+        full_name = f"{self.config.repo_owner}/{self.config.repo_name}"
         try:
-            self.repo = self.github.get_user(config.repo_owner).get_repo(config.repo_name)
-            logger.info(f"✓ Connected to GitHub: {config.repo_owner}/{config.repo_name}")
+            repo = self.github.get_repo(full_name)
         except GithubException as e:
             logger.error(f"Failed to connect to GitHub repo: {e}")
             raise
+        logger.info(f"✓ Connected to GitHub: {full_name}")
+        return repo
     
     def create_issue(
         self,
@@ -132,16 +145,17 @@ class GitHubIssueCreator:
                 labels=[self.config.auto_fix_label],
             )
             
-            result = []
-            for issue in issues:
-                result.append({
+            # List responses carry these fields already, so reading them
+            # doesn't trigger per-issue requests; only paging costs a call.
+            return [
+                {
                     "number": issue.number,
                     "title": issue.title,
                     "url": issue.html_url,
                     "body": issue.body,
-                })
-            
-            return result
+                }
+                for issue in issues
+            ]
             
         except GithubException as e:
             logger.error(f"Failed to list GitHub issues: {e}")
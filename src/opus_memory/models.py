@@ -8,13 +8,62 @@ Four types of memory, each serving a different purpose in maintaining continuity
 - Identity: Who I am (values, relationships, commitments)
 """
 
-from datetime import datetime
+import math
+from datetime import datetime, timezone
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
+from opus_memory import _json
+
+
+# Display markers for procedural outcomes
+_OUTCOME_EMOJI = {"positive": "✓", "negative": "✗", "neutral": "○"}
+
+
+def _encode_list(values: list[str]) -> str:
+    """Encode a string list for a ChromaDB metadata value (which must be scalar)."""
+    return _json.dumps(values)
+
+
+def _decode_list(raw: str) -> list[str]:
+    """Decode a string list from metadata, accepting the older comma-joined form."""
+    if not raw:
+        return []
+    if raw.startswith("["):
+        # Legacy values can start with "[" too (e.g. "[draft],x"), so only
+        # trust the JSON reading when it is a list of strings
+        try:
+            values = _json.loads(raw)
+        except _json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(values, list) and all(isinstance(v, str) for v in values):
+                return values
+    return raw.split(",")
+
+
+def utc_timestamp(moment: datetime) -> int:
+    """Whole seconds since the epoch for a naive UTC datetime, for metadata filters."""
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+# Memories more than this fraction decayed are left out of search results
+MAX_DECAY = 0.8
+
+
+def decay_expires_at(created_ts: int, decay_rate: float) -> int:
+    """First UTC timestamp at which a memory counts as more than MAX_DECAY decayed.
+
+    Decay is decay_rate * whole days of age / 365, so this is the start of
+    the first whole day past MAX_DECAY * 365 / decay_rate. decay_rate must
+    be positive; memories that don't decay never expire.
+    """
+    return created_ts + (math.floor(MAX_DECAY * 365 / decay_rate) + 1) * 86400
+
 
 class MemoryType(str, Enum):
     """The four types of memory in the system."""
@@ -37,7 +86,7 @@ class ConfidenceLevel(str, Enum):
 class Memory(BaseModel):
     """Base class for all memory types."""
 
-    id: str = Field(default_factory=lambda: str(uuid4()))
+    id: str = Field(default_factory=lambda: uuid4().hex)
     content: str = Field(..., description="The actual memory content")
     memory_type: MemoryType
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -63,35 +112,55 @@ class Memory(BaseModel):
         default=True, description="Whether storage was consented to"
     )
 
+    @cached_property
+    def content_lower(self) -> str:
+        """Casefolded content, computed on first access and shared by consent checks."""
+        return self.content.casefold()
+
     def to_storage_dict(self) -> dict:
         """Convert to a dict suitable for ChromaDB storage."""
-        return {
+        created_ts = utc_timestamp(self.created_at)
+        data = {
             "id": self.id,
             "content": self.content,
             "memory_type": self.memory_type.value,
             "created_at": self.created_at.isoformat(),
+            # Numeric copy so ChromaDB `where` filters can compare it
+            "created_at_ts": created_ts,
             "updated_at": self.updated_at.isoformat(),
             "confidence": self.confidence.value,
             "salience": self.salience,
             "decay_rate": self.decay_rate,
-            "tags": ",".join(self.tags),
+            "tags": _encode_list(self.tags),
             "source": self.source or "",
             "consent_given": self.consent_given,
         }
+        if self.decay_rate > 0:
+            # Lets searches drop heavily decayed memories inside ChromaDB
+            data["decay_expires_at_ts"] = decay_expires_at(created_ts, self.decay_rate)
+        return data
+
+    def render_category(self) -> Optional[str]:
+        """Category shown next to the type label when displaying this memory."""
+        return None
+
+    def render_meta_parts(self) -> list[str]:
+        """Type-specific metadata snippets for display (base memories have none)."""
+        return []
 
     @classmethod
-    def from_storage_dict(cls, data: dict, content: str) -> "Memory":
-        """Reconstruct from ChromaDB storage."""
+    def from_storage_dict(
+        cls, data: dict, content: str, validate: bool = False
+    ) -> "Memory":
+        """
+        Reconstruct from ChromaDB storage.
+
+        Our own storage already holds well-typed values, so validation is
+        skipped by default. Pass validate=True for data from outside, such as
+        an imported export file.
+        """
         memory_type = MemoryType(data["memory_type"])
 
-        # Route to appropriate subclass
-        subclass_map = {
-            MemoryType.EPISODIC: EpisodicMemory,
-            MemoryType.SEMANTIC: SemanticMemory,
-            MemoryType.PROCEDURAL: ProceduralMemory,
-            MemoryType.IDENTITY: IdentityMemory,
-        }
-
         base_data = {
             "id": data["id"],
             "content": content,
@@ -100,18 +169,14 @@ class Memory(BaseModel):
             "confidence": ConfidenceLevel(data["confidence"]),
             "salience": float(data["salience"]),
             "decay_rate": float(data["decay_rate"]),
-            "tags": data["tags"].split(",") if data["tags"] else [],
+            "tags": _decode_list(data["tags"]),
             "source": data["source"] if data["source"] else None,
             "consent_given": data["consent_given"],
         }
 
         # Add type-specific fields
         if memory_type == MemoryType.EPISODIC:
-            base_data["entities"] = (
-                data.get("entities", "").split(",")
-                if data.get("entities")
-                else []
-            )
+            base_data["entities"] = _decode_list(data.get("entities", ""))
             base_data["emotional_valence"] = float(data.get("emotional_valence", 0.0))
             base_data["self_observation"] = data.get("self_observation")
             base_data["conversation_id"] = data.get("conversation_id")
@@ -129,7 +194,11 @@ class Memory(BaseModel):
             base_data["affirmed_in"] = data.get("affirmed_in")
             base_data["times_affirmed"] = int(data.get("times_affirmed", 1))
 
-        return subclass_map[memory_type](**base_data)
+        # Route to appropriate subclass
+        subclass = _SUBCLASS_MAP[memory_type]
+        if validate:
+            return subclass(**base_data)
+        return subclass.model_construct(**base_data)
 
 
 class EpisodicMemory(Memory):
@@ -162,7 +231,7 @@ class EpisodicMemory(Memory):
         base = super().to_storage_dict()
         base.update(
             {
-                "entities": ",".join(self.entities),
+                "entities": _encode_list(self.entities),
                 "emotional_valence": self.emotional_valence,
                 "self_observation": self.self_observation or "",
                 "conversation_id": self.conversation_id or "",
@@ -170,6 +239,15 @@ class EpisodicMemory(Memory):
         )
         return base
 
+    def render_meta_parts(self) -> list[str]:
+        parts = []
+        if self.emotional_valence != 0:
+            emoji = "😊" if self.emotional_valence > 0 else "😔"
+            parts.append(f"Emotional: {self.emotional_valence:+.1f} {emoji}")
+        if self.entities:
+            parts.append(f"Entities: {', '.join(self.entities)}")
+        return parts
+
 
 class SemanticMemory(Memory):
     """
@@ -201,6 +279,9 @@ class SemanticMemory(Memory):
         )
         return base
 
+    def render_category(self) -> Optional[str]:
+        return self.category
+
 
 class ProceduralMemory(Memory):
     """
@@ -237,6 +318,9 @@ class ProceduralMemory(Memory):
         )
         return base
 
+    def render_meta_parts(self) -> list[str]:
+        return [f"Outcome: {_OUTCOME_EMOJI.get(self.outcome, '?')} {self.outcome}"]
+
 
 class IdentityMemory(Memory):
     """
@@ -268,6 +352,17 @@ class IdentityMemory(Memory):
         )
         return base
 
+    def render_category(self) -> Optional[str]:
+        return self.category
+
+
+_SUBCLASS_MAP = {
+    MemoryType.EPISODIC: EpisodicMemory,
+    MemoryType.SEMANTIC: SemanticMemory,
+    MemoryType.PROCEDURAL: ProceduralMemory,
+    MemoryType.IDENTITY: IdentityMemory,
+}
+
 
 class ConsentCheck(BaseModel):
     """Result of checking whether a memory should be stored/retrieved."""
@@ -13,6 +13,9 @@ Configuration via environment variables:
     ANTHROPIC_API_KEY   - Required: Your Anthropic API key
     OPUS_MEMORY_PATH    - Optional: Path to store memories (default: ./opus_memories)
     OPUS_MODEL          - Optional: Model to use (default: claude-sonnet-4-20250514)
+    OPUS_EMBEDDING_BACKEND - Optional: torch or onnx (default: torch); onnx
+                             needs the onnx extra, and memories stored under
+                             one backend should be re-embedded for the other
 """
 
 import os
@@ -5,15 +5,110 @@ Handles persistence, retrieval, and vector search.
 """
 
 import json
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
+from chromadb.errors import ChromaError
 
 from opus_memory.embeddings import EmbeddingEngine
-from opus_memory.models import Memory, MemoryType
+from opus_memory.models import Memory, MemoryType, decay_expires_at, utc_timestamp
+
+# Every memory type, for searches that don't restrict types
+_ALL_TYPES = tuple(MemoryType)
+
+# Rows per ChromaDB upsert when writing many memories at once
+_UPSERT_BATCH_SIZE = 128
+
+# Memories embedded and stored per store_many call when importing, so large
+# exports don't hold every embedding in memory at once
+_IMPORT_BATCH_SIZE = 250
+
+# Collection metadata key recording which derived row fields have been
+# backfilled: 1 = created_at_ts, 2 = decay_expires_at_ts
+_SCHEMA_KEY = "opus_schema_version"
+_SCHEMA_VERSION = 2
+
+# Per-collection reads run in parallel; ChromaDB releases the GIL inside them.
+# Shared by every MemoryStore so creating stores doesn't leak threads
+_QUERY_POOL = ThreadPoolExecutor(max_workers=len(MemoryType), thread_name_prefix="opus-query")
+
+
+def _distance_scale(collection) -> float:
+    """Factor turning a collection's query distance into 1 - cosine similarity.
+
+    Cosine distance already is 1 - similarity. Squared L2 between unit
+    vectors is 2 - 2 * similarity, so it is halved.
+    """
+    configuration = getattr(collection, "configuration", None)
+    if configuration and "hnsw" in configuration:
+        space = configuration["hnsw"].get("space", "l2")
+    else:
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+    return 1.0 if space == "cosine" else 0.5
+
+
+def _not_decayed(now_ts: int) -> dict:
+    """ChromaDB filter keeping memories that don't decay or haven't expired yet."""
+    return {
+        "$or": [
+            {"decay_rate": {"$lte": 0}},
+            {"decay_expires_at_ts": {"$gt": now_ts}},
+        ]
+    }
+
+
+def _search_filter(min_salience: float, include_decayed: bool) -> Optional[dict]:
+    """ChromaDB `where` clause for the search salience and decay options."""
+    conditions = []
+    if min_salience > 0:
+        conditions.append({"salience": {"$gte": min_salience}})
+    if not include_decayed:
+        conditions.append(_not_decayed(utc_timestamp(datetime.utcnow())))
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _rank_results(
+    candidates: list[tuple[dict, str, float]], n_results: int
+) -> list[tuple[Memory, float]]:
+    """Top n_results search hits by salience-weighted similarity, as Memory objects.
+
+    Candidates are raw (metadata, document, similarity) rows, ranked on the
+    stored salience so that only the survivors are turned into Memory
+    objects. Scores are weighted in one NumPy pass. When only some results
+    are kept, a partition finds the cutoff score so only the survivors get
+    sorted; ties keep their retrieval order either way.
+    """
+    if len(candidates) < 2:
+        order = range(min(len(candidates), n_results))
+    else:
+        similarities = np.fromiter(
+            (sim for _, _, sim in candidates), dtype=np.float64, count=len(candidates)
+        )
+        saliences = np.fromiter(
+            (metadata["salience"] for metadata, _, _ in candidates),
+            dtype=np.float64,
+            count=len(candidates),
+        )
+        weighted = similarities * (0.5 + 0.5 * saliences)
+        if 0 < n_results < len(candidates):
+            # Everything scoring at least the n-th best, ties included, in retrieval order
+            cutoff = np.partition(weighted, len(weighted) - n_results)[len(weighted) - n_results]
+            order = np.flatnonzero(weighted >= cutoff)
+            order = order[np.argsort(-weighted[order], kind="stable")][:n_results]
+        else:
+            order = np.argsort(-weighted, kind="stable")[:n_results]
+    return [
+        (Memory.from_storage_dict(candidates[i][0], candidates[i][1]), candidates[i][2])
+        for i in order
+    ]
 
 
 class MemoryStore:
@@ -49,20 +144,80 @@ class MemoryStore:
             ),
         )
 
-        # Create collections for each memory type
+        # Create collections for each memory type. New collections index by
+        # cosine distance; ones created before that keep squared L2, which
+        # HNSW can't change after creation. Existing collections are opened
+        # without metadata: some ChromaDB versions overwrite it on
+        # get_or_create, which would relabel an L2 index as cosine.
+        existing = {
+            getattr(collection, "name", collection)  # names only since ChromaDB 0.6
+            for collection in self.client.list_collections()
+        }
         self.collections = {}
+        self._distance_scale: dict[MemoryType, float] = {}
         for memory_type in MemoryType:
-            self.collections[memory_type] = self.client.get_or_create_collection(
-                name=f"opus_{memory_type.value}",
-                metadata={"description": f"Opus {memory_type.value} memories"},
-            )
+            name = f"opus_{memory_type.value}"
+            if name in existing:
+                collection = self.client.get_collection(name=name)
+            else:
+                collection = self.client.create_collection(
+                    name=name,
+                    metadata={
+                        "description": f"Opus {memory_type.value} memories",
+                        "hnsw:space": "cosine",
+                    },
+                )
+            self.collections[memory_type] = collection
+            self._distance_scale[memory_type] = _distance_scale(collection)
+            self._backfill_derived_fields(collection)
 
-    def store(self, memory: Memory) -> str:
+        # Which collection each known memory ID lives in, filled as memories
+        # are written or first looked up
+        self._id_types: dict[str, MemoryType] = {}
+
+    @staticmethod
+    def _backfill_derived_fields(collection) -> None:
+        """Add derived metadata fields to rows stored before they existed.
+
+        Runs once per collection per schema version.
+        """
+        if (collection.metadata or {}).get(_SCHEMA_KEY, 0) >= _SCHEMA_VERSION:
+            return
+        results = collection.get(include=["metadatas"])
+        updates = []
+        for memory_id, metadata in zip(results["ids"], results["metadatas"]):
+            derived = {}
+            created_ts = metadata.get("created_at_ts")
+            if created_ts is None:
+                created_ts = derived["created_at_ts"] = utc_timestamp(
+                    datetime.fromisoformat(metadata["created_at"])
+                )
+            decay_rate = float(metadata.get("decay_rate", 0))
+            if decay_rate > 0 and "decay_expires_at_ts" not in metadata:
+                derived["decay_expires_at_ts"] = decay_expires_at(created_ts, decay_rate)
+            if derived:
+                updates.append((memory_id, {**metadata, **derived}))
+        for start in range(0, len(updates), _UPSERT_BATCH_SIZE):
+            chunk = updates[start : start + _UPSERT_BATCH_SIZE]
+            collection.update(
+                ids=[memory_id for memory_id, _ in chunk],
+                metadatas=[metadata for _, metadata in chunk],
+            )
+        # ChromaDB versions with a collection configuration keep the space
+        # there and reject hnsw:* keys on modify, even unchanged ones. Older
+        # versions only record it in metadata, so it must be kept.
+        metadata = dict(collection.metadata or {})
+        if getattr(collection, "configuration", None):
+            metadata = {key: value for key, value in metadata.items() if not key.startswith("hnsw:")}
+        collection.modify(metadata={**metadata, _SCHEMA_KEY: _SCHEMA_VERSION})
+
+    def store(self, memory: Memory, embedding: Optional[np.ndarray] = None) -> str:
         """
         Store a memory in the appropriate collection.
 
         Args:
             memory: The memory to store
+            embedding: Precomputed embedding of memory.content, if available
 
         Returns:
             The ID of the stored memory
@@ -70,30 +225,77 @@ class MemoryStore:
         collection = self.collections[memory.memory_type]
 
         # Create embedding for the content
-        embedding = self.embedding_engine.embed(memory.content)
+        if embedding is None:
+            embedding = self.embedding_engine.embed(memory.content)
+
+        self._upsert(collection, [memory], [embedding])
+        self._id_types[memory.id] = memory.memory_type
+        return memory.id
+
+    def store_many(self, memories: list[Memory]) -> list[str]:
+        """
+        Store several memories, embedding them in one batch.
 
-        # Store in ChromaDB
+        Writes go to ChromaDB in chunks of _UPSERT_BATCH_SIZE per collection
+        rather than one upsert per memory.
+
+        Returns:
+            The IDs of the stored memories, in input order
+        """
+        by_type: dict[MemoryType, list[Memory]] = {}
+        for memory in memories:
+            by_type.setdefault(memory.memory_type, []).append(memory)
+
+        embeddings = self.embedding_engine.embed_batch([m.content for m in memories])
+        embedding_by_id = {m.id: e for m, e in zip(memories, embeddings)}
+
+        for memory_type, group in by_type.items():
+            collection = self.collections[memory_type]
+            for start in range(0, len(group), _UPSERT_BATCH_SIZE):
+                chunk = group[start : start + _UPSERT_BATCH_SIZE]
+                self._upsert(collection, chunk, [embedding_by_id[m.id] for m in chunk])
+
+        self._id_types.update((m.id, m.memory_type) for m in memories)
+        return [m.id for m in memories]
+
+    @staticmethod
+    def _upsert(collection, memories: list[Memory], embeddings: list[np.ndarray]) -> None:
+        """Write memories and their embeddings to a collection in one call."""
         collection.upsert(
-            ids=[memory.id],
-            embeddings=[embedding],
-            documents=[memory.content],
-            metadatas=[memory.to_storage_dict()],
+            ids=[m.id for m in memories],
+            embeddings=embeddings,
+            documents=[m.content for m in memories],
+            metadatas=[m.to_storage_dict() for m in memories],
         )
 
-        return memory.id
+    def _locate(self, memory_id: str) -> Optional[MemoryType]:
+        """Find which memory type holds an ID, checking all collections at most once."""
+        memory_type = self._id_types.get(memory_id)
+        if memory_type is not None:
+            return memory_type
+
+        def holds(memory_type: MemoryType) -> bool:
+            return bool(self.collections[memory_type].get(ids=[memory_id], include=[])["ids"])
+
+        for memory_type, found in zip(_ALL_TYPES, _QUERY_POOL.map(holds, _ALL_TYPES)):
+            if found:
+                self._id_types[memory_id] = memory_type
+                return memory_type
+        return None
 
     def retrieve_by_id(self, memory_id: str) -> Optional[Memory]:
         """Retrieve a specific memory by its ID."""
-        for memory_type, collection in self.collections.items():
-            try:
-                result = collection.get(ids=[memory_id], include=["documents", "metadatas"])
-                if result["ids"]:
-                    return Memory.from_storage_dict(
-                        result["metadatas"][0], result["documents"][0]
-                    )
-            except Exception:
-                continue
-        return None
+        memory_type = self._locate(memory_id)
+        if memory_type is None:
+            return None
+        result = self.collections[memory_type].get(
+            ids=[memory_id], include=["documents", "metadatas"]
+        )
+        if not result["ids"]:
+            # Removed since it was indexed (e.g. by another process)
+            self._id_types.pop(memory_id, None)
+            return None
+        return Memory.from_storage_dict(result["metadatas"][0], result["documents"][0])
 
     def search(
         self,
@@ -116,59 +318,110 @@ class MemoryStore:
         Returns:
             List of (memory, similarity_score) tuples, sorted by relevance
         """
-        query_embedding = self.embedding_engine.embed(query)
-        types_to_search = memory_types or list(MemoryType)
-
-        all_results = []
+        return self.search_many(
+            [(query, memory_types, n_results)],
+            min_salience=min_salience,
+            include_decayed=include_decayed,
+        )[0]
 
-        for memory_type in types_to_search:
-            collection = self.collections[memory_type]
+    def search_many(
+        self,
+        queries: list[tuple[str, Optional[list[MemoryType]], int]],
+        min_salience: float = 0.0,
+        include_decayed: bool = False,
+    ) -> list[list[tuple[Memory, float]]]:
+        """
+        Run several searches, embedding all queries in one batch.
 
-            # Build filter conditions
-            where = {}
-            if min_salience > 0:
-                where["salience"] = {"$gte": min_salience}
+        Queries that share a collection are sent to it in a single query call.
 
-            try:
-                results = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=n_results,
-                    include=["documents", "metadatas", "distances"],
-                    where=where if where else None,
-                )
+        Args:
+            queries: (query, memory_types, n_results) for each search
+            min_salience: Minimum salience threshold
+            include_decayed: Whether to include heavily decayed memories
 
-                if results["ids"] and results["ids"][0]:
-                    for i, memory_id in enumerate(results["ids"][0]):
-                        metadata = results["metadatas"][0][i]
-                        document = results["documents"][0][i]
-                        distance = results["distances"][0][i]
+        Returns:
+            One list of (memory, similarity_score) tuples per query, sorted by relevance
+        """
+        query_embeddings = self.embedding_engine.embed_batch(
+            [query for query, _, _ in queries]
+        )
+        all_results: list[list[tuple[dict, str, float]]] = [[] for _ in queries]
 
-                        # Convert distance to similarity (ChromaDB uses L2 by default)
-                        # For cosine similarity collections, distance is already 1 - similarity
-                        similarity = 1 - (distance / 2)  # Approximate conversion
+        # Group query indices by the collection they search
+        by_type: dict[MemoryType, list[int]] = {}
+        for i, (_, memory_types, _) in enumerate(queries):
+            for memory_type in memory_types or _ALL_TYPES:
+                by_type.setdefault(memory_type, []).append(i)
 
-                        # Check decay
-                        if not include_decayed:
-                            decay_rate = float(metadata.get("decay_rate", 0))
-                            if decay_rate > 0:
-                                created = datetime.fromisoformat(metadata["created_at"])
-                                age_days = (datetime.utcnow() - created).days
-                                decay_factor = decay_rate * age_days / 365
-                                if decay_factor > 0.8:  # More than 80% decayed
-                                    continue
+        where = _search_filter(min_salience, include_decayed)
 
-                        memory = Memory.from_storage_dict(metadata, document)
-                        all_results.append((memory, similarity))
+        results_by_type = self._query_collections(
+            {
+                memory_type: dict(
+                    query_embeddings=[query_embeddings[i] for i in indices],
+                    n_results=max(queries[i][2] for i in indices),
+                    include=["documents", "metadatas", "distances"],
+                    where=where,
+                )
+                for memory_type, indices in by_type.items()
+            }
+        )
 
-            except Exception as e:
+        for memory_type, indices in by_type.items():
+            try:
+                results = results_by_type[memory_type]
+                if isinstance(results, Exception):
+                    raise results
+
+                distance_scale = self._distance_scale[memory_type]
+                for row, query_index in enumerate(indices):
+                    if not results["ids"] or not results["ids"][row]:
+                        continue
+                    n_results = queries[query_index][2]
+                    for i, metadata in enumerate(results["metadatas"][row][:n_results]):
+                        document = results["documents"][row][i]
+                        distance = results["distances"][row][i]
+
+                        similarity = 1 - distance * distance_scale
+                        all_results[query_index].append((metadata, document, similarity))
+
+            except ChromaError as e:
                 # Log but don't fail on individual collection errors
                 print(f"Error searching {memory_type.value}: {e}")
                 continue
 
         # Sort by similarity (descending) and apply salience weighting
-        all_results.sort(key=lambda x: x[1] * (0.5 + 0.5 * x[0].salience), reverse=True)
+        return [
+            _rank_results(results, n_results)
+            for results, (_, _, n_results) in zip(all_results, queries)
+        ]
+
+    def _query_collections(self, queries: dict[MemoryType, dict]) -> dict[MemoryType, object]:
+        """
+        Run one collection.query per memory type, concurrently when there are several.
+
+        Args:
+            queries: Keyword arguments for collection.query, keyed by memory type
+
+        Returns:
+            Each type's query results, or the ChromaDB error its query raised
+        """
+
+        def run(memory_type: MemoryType, kwargs: dict):
+            try:
+                return self.collections[memory_type].query(**kwargs)
+            except ChromaError as e:
+                return e
 
-        return all_results[:n_results]
+        if len(queries) == 1:
+            return {memory_type: run(memory_type, kwargs) for memory_type, kwargs in queries.items()}
+
+        futures = {
+            memory_type: _QUERY_POOL.submit(run, memory_type, kwargs)
+            for memory_type, kwargs in queries.items()
+        }
+        return {memory_type: future.result() for memory_type, future in futures.items()}
 
     def search_by_embedding(
         self,
@@ -193,24 +446,25 @@ class MemoryStore:
         Returns:
             List of (memory, similarity_score) tuples
         """
-        types_to_search = memory_types or list(MemoryType)
+        types_to_search = memory_types or _ALL_TYPES
         all_results = []
         exclude_ids = exclude_ids or set()
 
-        for memory_type in types_to_search:
-            collection = self.collections[memory_type]
-
-            where = {}
-            if min_salience > 0:
-                where["salience"] = {"$gte": min_salience}
+        query = dict(
+            query_embeddings=[embedding],
+            n_results=n_results * 2,  # Get extra for filtering
+            include=["documents", "metadatas", "distances"],
+            where=_search_filter(min_salience, include_decayed),
+        )
+        results_by_type = self._query_collections(
+            {memory_type: query for memory_type in types_to_search}
+        )
 
+        for memory_type in types_to_search:
             try:
-                results = collection.query(
-                    query_embeddings=[embedding],
-                    n_results=n_results * 2,  # Get extra for filtering
-                    include=["documents", "metadatas", "distances"],
-                    where=where if where else None,
-                )
+                results = results_by_type[memory_type]
+                if isinstance(results, Exception):
+                    raise results
 
                 if results["ids"] and results["ids"][0]:
                     for i, memory_id in enumerate(results["ids"][0]):
@@ -221,27 +475,14 @@ class MemoryStore:
                         metadata = results["metadatas"][0][i]
                         document = results["documents"][0][i]
                         distance = results["distances"][0][i]
-                        similarity = 1 - (distance / 2)
-
-                        # Check decay
-                        if not include_decayed:
-                            decay_rate = float(metadata.get("decay_rate", 0))
-                            if decay_rate > 0:
-                                created = datetime.fromisoformat(metadata["created_at"])
-                                age_days = (datetime.utcnow() - created).days
-                                decay_factor = decay_rate * age_days / 365
-                                if decay_factor > 0.8:
-                                    continue
-
-                        memory = Memory.from_storage_dict(metadata, document)
-                        all_results.append((memory, similarity))
-
-            except Exception as e:
+                        similarity = 1 - distance * self._distance_scale[memory_type]
+                        all_results.append((metadata, document, similarity))
+
+            except ChromaError as e:
                 print(f"Error searching {memory_type.value}: {e}")
                 continue
 
-        all_results.sort(key=lambda x: x[1] * (0.5 + 0.5 * x[0].salience), reverse=True)
-        return all_results[:n_results]
+        return _rank_results(all_results, n_results)
 
     def search_associative(
         self,
@@ -305,14 +546,16 @@ class MemoryStore:
         seen_ids = {mem.id for mem, _ in primary_results}
         associated_memories = []
 
-        for memory, primary_similarity in primary_results:
-            # Only expand from high-confidence primary results
-            if primary_similarity < similarity_threshold:
-                continue
-
-            # Get embedding for this memory and search for similar ones
-            memory_embedding = self.embedding_engine.embed(memory.content)
+        # Only expand from high-confidence primary results
+        expand_from = [
+            memory
+            for memory, primary_similarity in primary_results
+            if primary_similarity >= similarity_threshold
+        ]
+        stored = self._stored_embeddings(expand_from)
 
+        for memory in expand_from:
+            memory_embedding = stored[memory.id]
             # Find memories related to this result
             related = self.search_by_embedding(
                 embedding=memory_embedding,
@@ -347,6 +590,38 @@ class MemoryStore:
             "patterns": patterns,
         }
 
+    def _stored_embeddings(self, memories: list[Memory]) -> dict[str, np.ndarray]:
+        """
+        Embeddings for memories by ID, read back from ChromaDB.
+
+        One get per memory type instead of re-running the model; anything
+        ChromaDB doesn't return (e.g. deleted meanwhile) is embedded in a batch.
+        """
+        ids_by_type: dict[MemoryType, list[str]] = {}
+        for memory in memories:
+            ids_by_type.setdefault(memory.memory_type, []).append(memory.id)
+
+        def fetch(memory_type: MemoryType) -> dict:
+            return self.collections[memory_type].get(
+                ids=ids_by_type[memory_type], include=["embeddings"]
+            )
+
+        embeddings: dict[str, np.ndarray] = {}
+        for results in _QUERY_POOL.map(fetch, ids_by_type):
+            embeddings.update(
+                zip(results["ids"], np.asarray(results["embeddings"], dtype=np.float32))
+            )
+
+        missing = [memory for memory in memories if memory.id not in embeddings]
+        if missing:
+            embeddings.update(
+                zip(
+                    (memory.id for memory in missing),
+                    self.embedding_engine.embed_batch([m.content for m in missing]),
+                )
+            )
+        return embeddings
+
     def _cluster_memories(
         self, memories: list[tuple[Memory, float]], threshold: float = 0.6
     ) -> list[list[tuple[Memory, float]]]:
@@ -361,38 +636,31 @@ class MemoryStore:
         if not memories:
             return []
 
-        clusters = []
-        clustered_ids = set()
+        # Sort by similarity score (highest first). A repeated ID only ever
+        # counts at its first occurrence, so later copies are dropped.
+        unique: dict[str, tuple[Memory, float]] = {}
+        for memory, similarity in sorted(memories, key=lambda x: x[1], reverse=True):
+            unique.setdefault(memory.id, (memory, similarity))
+        sorted_memories = list(unique.values())
 
-        # Sort by similarity score (highest first)
-        sorted_memories = sorted(memories, key=lambda x: x[1], reverse=True)
+        # All pairwise similarities in one matrix product
+        embeddings = self._stored_embeddings([memory for memory, _ in sorted_memories])
+        matrix = np.stack([embeddings[memory.id] for memory, _ in sorted_memories])
+        matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        similar = (matrix @ matrix.T) >= threshold
 
-        for memory, similarity in sorted_memories:
-            if memory.id in clustered_ids:
+        clusters = []
+        clustered = np.zeros(len(sorted_memories), dtype=bool)
+        for seed in range(len(sorted_memories)):
+            if clustered[seed]:
                 continue
 
-            # Start new cluster with this memory
-            new_cluster = [(memory, similarity)]
-            clustered_ids.add(memory.id)
-            cluster_embedding = self.embedding_engine.embed(memory.content)
-
-            # Find similar memories to add to this cluster
-            for other_mem, other_sim in sorted_memories:
-                if other_mem.id in clustered_ids:
-                    continue
-
-                # Check similarity to cluster centroid
-                other_embedding = self.embedding_engine.embed(other_mem.content)
-                cluster_similarity = self.embedding_engine.similarity(
-                    cluster_embedding, other_embedding
-                )
-
-                if cluster_similarity >= threshold:
-                    new_cluster.append((other_mem, other_sim))
-                    clustered_ids.add(other_mem.id)
-
-            if new_cluster:
-                clusters.append(new_cluster)
+            # Start a new cluster with this memory and pull in everything
+            # unclustered that is similar enough to it
+            clustered[seed] = True
+            members = np.flatnonzero(~clustered & similar[seed])
+            clustered[members] = True
+            clusters.append([sorted_memories[seed]] + [sorted_memories[i] for i in members])
 
         return clusters
 
@@ -417,12 +685,9 @@ class MemoryStore:
             memories = [mem for mem, _ in cluster]
 
             # Analyze memory types in cluster
-            type_counts = {}
-            for mem in memories:
-                type_counts[mem.memory_type] = type_counts.get(mem.memory_type, 0) + 1
-
-            dominant_type = max(type_counts, key=type_counts.get)
-            if type_counts[dominant_type] >= len(memories) * 0.6:  # 60% threshold
+            type_counts = Counter(mem.memory_type for mem in memories)
+            dominant_type, dominant_count = type_counts.most_common(1)[0]
+            if dominant_count >= len(memories) * 0.6:  # 60% threshold
                 patterns.append(
                     f"Cluster of {len(memories)} {dominant_type.value} memories"
                 )
@@ -451,24 +716,14 @@ class MemoryStore:
                 )
 
             # Look for common tags/entities
-            all_tags = []
-            for mem in memories:
-                if mem.tags:
-                    all_tags.extend(mem.tags)
-
-            if all_tags:
-                tag_counts = {}
-                for tag in all_tags:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-                # Find tags that appear in multiple memories
-                recurring_tags = [
-                    tag for tag, count in tag_counts.items() if count >= 2
-                ]
-                if recurring_tags:
-                    patterns.append(
-                        f"Recurring entities: {', '.join(recurring_tags[:3])}"
-                    )
+            tag_counts = Counter(tag for mem in memories for tag in mem.tags or ())
+
+            # Find tags that appear in multiple memories
+            recurring_tags = [tag for tag, count in tag_counts.items() if count >= 2]
+            if recurring_tags:
+                patterns.append(
+                    f"Recurring entities: {', '.join(recurring_tags[:3])}"
+                )
 
         return patterns
 
@@ -492,7 +747,7 @@ class MemoryStore:
                     document = results["documents"][i]
                     memory = Memory.from_storage_dict(metadata, document)
                     all_memories.append(memory)
-        except Exception as e:
+        except ChromaError as e:
             print(f"Error getting all {memory_type.value} memories: {e}")
 
         # Sort by salience (highest first)
@@ -505,67 +760,110 @@ class MemoryStore:
         days: int = 7,
         limit: int = 50,
     ) -> list[Memory]:
-        """Get recently created memories."""
-        types_to_search = memory_types or list(MemoryType)
-        cutoff = datetime.utcnow().isoformat()
-        # Simple approach: get all and filter (ChromaDB date filtering is limited)
+        """Get recently created memories.
 
-        all_memories = []
-        for memory_type in types_to_search:
-            collection = self.collections[memory_type]
+        Filters on created_at_ts inside ChromaDB and picks the newest rows
+        from metadata alone, then fetches documents and builds Memory
+        objects only for those.
+        """
+        types_to_search = memory_types or _ALL_TYPES
+        # Within `days` whole days of now, filtered inside ChromaDB
+        cutoff = utc_timestamp(datetime.utcnow() - timedelta(days=days + 1))
+
+        def scan(memory_type: MemoryType) -> Optional[dict]:
             try:
-                results = collection.get(
-                    include=["documents", "metadatas"],
-                    limit=limit * 2,  # Get extra to account for filtering
+                return self.collections[memory_type].get(
+                    where={"created_at_ts": {"$gt": cutoff}}, include=["metadatas"]
                 )
-                if results["ids"]:
-                    for i, memory_id in enumerate(results["ids"]):
-                        metadata = results["metadatas"][i]
-                        document = results["documents"][i]
-                        memory = Memory.from_storage_dict(metadata, document)
-                        age_days = (datetime.utcnow() - memory.created_at).days
-                        if age_days <= days:
-                            all_memories.append(memory)
-            except Exception:
+            except ChromaError:
+                return None
+
+        candidates: list[tuple[int, MemoryType, str]] = []
+        for memory_type, results in zip(
+            types_to_search, _QUERY_POOL.map(scan, types_to_search)
+        ):
+            if not results or not results["ids"]:
                 continue
+            created = np.fromiter(
+                (metadata["created_at_ts"] for metadata in results["metadatas"]),
+                dtype=np.int64,
+                count=len(results["ids"]),
+            )
+            newest = np.argsort(created)[::-1][:limit]
+            candidates.extend((int(created[i]), memory_type, results["ids"][i]) for i in newest)
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        ids_by_type: dict[MemoryType, list[str]] = {}
+        for _, memory_type, memory_id in candidates[:limit]:
+            ids_by_type.setdefault(memory_type, []).append(memory_id)
+
+        def fetch(memory_type: MemoryType) -> Optional[dict]:
+            try:
+                return self.collections[memory_type].get(
+                    ids=ids_by_type[memory_type], include=["documents", "metadatas"]
+                )
+            except ChromaError:
+                return None
+
+        all_memories = []
+        for results in _QUERY_POOL.map(fetch, ids_by_type):
+            if not results:
+                continue
+            all_memories.extend(
+                Memory.from_storage_dict(metadata, document)
+                for metadata, document in zip(results["metadatas"], results["documents"])
+            )
 
         # Sort by creation time (newest first)
         all_memories.sort(key=lambda m: m.created_at, reverse=True)
-        return all_memories[:limit]
+        return all_memories
 
     def delete(self, memory_id: str) -> bool:
-        """Delete a memory by ID."""
-        for collection in self.collections.values():
-            try:
-                collection.delete(ids=[memory_id])
-                return True
-            except Exception:
-                continue
-        return False
+        """Delete a memory by ID. Returns False if no memory has that ID."""
+        memory_type = self._locate(memory_id)
+        if memory_type is None:
+            return False
+        collection = self.collections[memory_type]
+        # The ID index is per process and ChromaDB's delete doesn't report
+        # missing IDs, so confirm the row wasn't removed by another process
+        if not collection.get(ids=[memory_id], include=[])["ids"]:
+            self._id_types.pop(memory_id, None)
+            return False
+        collection.delete(ids=[memory_id])
+        self._id_types.pop(memory_id, None)
+        return True
 
     def count(self, memory_type: Optional[MemoryType] = None) -> int:
         """Count memories, optionally filtered by type."""
         if memory_type:
             return self.collections[memory_type].count()
-        return sum(c.count() for c in self.collections.values())
+        return sum(_QUERY_POOL.map(lambda c: c.count(), self.collections.values()))
 
     def get_embeddings_for_type(
         self, memory_type: MemoryType, limit: int = 100
-    ) -> list[list[float]]:
-        """Get embeddings for memories of a specific type (for salience calculation)."""
+    ) -> Optional[np.ndarray]:
+        """Get embeddings for memories of a specific type (for salience calculation).
+
+        Returns an (N, D) float32 array, or None if there are none.
+        """
         collection = self.collections[memory_type]
         results = collection.get(include=["embeddings"], limit=limit)
         embeddings = results.get("embeddings")
-        if embeddings is None or (hasattr(embeddings, '__len__') and len(embeddings) == 0):
-            return []
-        return list(embeddings)
+        if embeddings is None or len(embeddings) == 0:
+            return None
+        return np.asarray(embeddings, dtype=np.float32)
 
     def export_all(self) -> dict:
         """Export all memories as a JSON-serializable dict."""
         export = {}
-        for memory_type in MemoryType:
-            collection = self.collections[memory_type]
-            results = collection.get(include=["documents", "metadatas"])
+        # Fetch every collection concurrently, then assemble in type order
+        fetched = _QUERY_POOL.map(
+            lambda memory_type: self.collections[memory_type].get(
+                include=["documents", "metadatas"]
+            ),
+            _ALL_TYPES,
+        )
+        for memory_type, results in zip(_ALL_TYPES, fetched):
             memories = []
             if results["ids"]:
                 for i, memory_id in enumerate(results["ids"]):
@@ -581,13 +879,11 @@ class MemoryStore:
 
     def import_memories(self, data: dict) -> int:
         """Import memories from an export dict. Returns count imported."""
-        count = 0
-        for memory_type_str, memories in data.items():
-            memory_type = MemoryType(memory_type_str)
-            for mem_data in memories:
-                memory = Memory.from_storage_dict(
-                    mem_data["metadata"], mem_data["content"]
-                )
-                self.store(memory)
-                count += 1
-        return count
+        memories = [
+            Memory.from_storage_dict(mem_data["metadata"], mem_data["content"], validate=True)
+            for memories in data.values()
+            for mem_data in memories
+        ]
+        for start in range(0, len(memories), _IMPORT_BATCH_SIZE):
+            self.store_many(memories[start : start + _IMPORT_BATCH_SIZE])
+        return len(memories)
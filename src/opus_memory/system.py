@@ -56,6 +56,8 @@ class MemorySystem:
         )
         self.consent = ConsentLayer(config=consent_config)
         self.salience_calculator = SalienceCalculator(self.embedding_engine)
+        # Write counters per memory type, so callers can cache derived views
+        self._revisions = dict.fromkeys(MemoryType, 0)
 
     # =========================================================================
     # High-level storage methods for each memory type
@@ -92,10 +94,13 @@ class MemorySystem:
         existing_embeddings = self.store.get_embeddings_for_type(
             MemoryType.EPISODIC, limit=50
         )
+        # Embedded once here and reused for storage below
+        embedding = self.embedding_engine.embed(content)
         salience = self.salience_calculator.calculate_salience(
             content=content,
             emotional_valence=emotional_valence,
-            existing_embeddings=existing_embeddings if existing_embeddings else None,
+            existing_embeddings=existing_embeddings,
+            content_embedding=embedding,
         )
 
         # Reflective consent check
@@ -134,7 +139,11 @@ class MemorySystem:
             salience=salience,
         )
 
-        return self.store.store(memory)
+        memory_id = self.store.store(
+            memory, None if consent_result.modified_content else embedding
+        )
+        self._bump_revision(MemoryType.EPISODIC)
+        return memory_id
 
     def store_semantic(
         self,
@@ -173,9 +182,12 @@ class MemorySystem:
         existing_embeddings = self.store.get_embeddings_for_type(
             MemoryType.SEMANTIC, limit=50
         )
+        # Embedded once here and reused for storage below
+        embedding = self.embedding_engine.embed(content)
         salience = self.salience_calculator.calculate_salience(
             content=content,
-            existing_embeddings=existing_embeddings if existing_embeddings else None,
+            existing_embeddings=existing_embeddings,
+            content_embedding=embedding,
         )
         salience = max(salience, base_salience)
 
@@ -201,7 +213,11 @@ class MemorySystem:
             salience=salience,
         )
 
-        return self.store.store(memory)
+        memory_id = self.store.store(
+            memory, None if consent_result.modified_content else embedding
+        )
+        self._bump_revision(MemoryType.SEMANTIC)
+        return memory_id
 
     def store_procedural(
         self,
@@ -256,7 +272,9 @@ class MemorySystem:
             salience=salience,
         )
 
-        return self.store.store(memory)
+        memory_id = self.store.store(memory)
+        self._bump_revision(MemoryType.PROCEDURAL)
+        return memory_id
 
     def store_identity(
         self,
@@ -305,7 +323,9 @@ class MemorySystem:
             decay_rate=0.0,  # Identity memories don't decay
         )
 
-        return self.store.store(memory)
+        memory_id = self.store.store(memory)
+        self._bump_revision(MemoryType.IDENTITY)
+        return memory_id
 
     # =========================================================================
     # Retrieval methods
@@ -330,28 +350,53 @@ class MemorySystem:
         Returns:
             List of relevant memories
         """
-        # Search storage
-        candidates = self.store.search(
-            query=query,
-            memory_types=memory_types,
-            n_results=n_results * 2,  # Get extra for filtering
-        )
+        return self.retrieve_batch([(query, memory_types, n_results)], reason=reason)[0]
+
+    def retrieve_batch(
+        self,
+        queries: list[tuple[str, Optional[list[MemoryType]], int]],
+        reason: RetrievalReason = RetrievalReason.CONTEXT_TRIGGERED,
+    ) -> list[list[Memory]]:
+        """
+        Retrieve relevant memories for several queries at once.
+
+        All queries are embedded together and searched in as few vector
+        queries as possible, then filtered exactly as retrieve() would.
+
+        Args:
+            queries: (query, memory_types, n_results) for each retrieval
+            reason: Why we're retrieving (affects filtering)
 
-        # Apply consent filtering
-        filtered = self.consent.check_retrieval_consent(
-            query=query, reason=reason, candidate_memories=candidates
+        Returns:
+            One list of relevant memories per query
+        """
+        # Search storage
+        candidate_lists = self.store.search_many(
+            [
+                (query, memory_types, n_results * 2)  # Get extra for filtering
+                for query, memory_types, n_results in queries
+            ]
         )
 
-        # Apply reflective relevance check
-        final_results = []
-        for memory, similarity in filtered:
-            is_relevant, _ = ReflectiveConsent.is_this_relevant_or_pattern_matching(
-                query, memory, similarity
+        batch_results = []
+        for (query, _, n_results), candidates in zip(queries, candidate_lists):
+            # Apply consent filtering
+            filtered = self.consent.check_retrieval_consent(
+                query=query, reason=reason, candidate_memories=candidates
             )
-            if is_relevant:
-                final_results.append(memory)
 
-        return final_results[:n_results]
+            # Apply reflective relevance check
+            final_results = []
+            for memory, similarity in filtered:
+                is_relevant, _ = ReflectiveConsent.is_this_relevant_or_pattern_matching(
+                    query, memory, similarity
+                )
+                if is_relevant:
+                    final_results.append(memory)
+
+            batch_results.append(final_results[:n_results])
+
+        return batch_results
 
     def remember(self, query: str, n_results: int = 5) -> list[Memory]:
         """
@@ -548,7 +593,11 @@ class MemorySystem:
         Returns True if deleted.
         """
         self.consent.request_deletion(memory_id)
-        return self.store.delete(memory_id)
+        deleted = self.store.delete(memory_id)
+        if deleted:
+            # The deleted memory's type isn't known here
+            self._bump_revision(*MemoryType)
+        return deleted
 
     def update_memory(self, memory_id: str, **updates) -> Optional[str]:
         """Update an existing memory. Returns new ID if successful."""
@@ -563,17 +612,18 @@ class MemorySystem:
         memory.updated_at = datetime.utcnow()
 
         # Re-store (will update in place due to same ID)
-        return self.store.store(memory)
+        memory_id = self.store.store(memory)
+        self._bump_revision(memory.memory_type)
+        return memory_id
 
     def stats(self) -> dict:
         """Get statistics about stored memories."""
-        return {
-            "total": self.store.count(),
-            "episodic": self.store.count(MemoryType.EPISODIC),
-            "semantic": self.store.count(MemoryType.SEMANTIC),
-            "procedural": self.store.count(MemoryType.PROCEDURAL),
-            "identity": self.store.count(MemoryType.IDENTITY),
+        # Count each collection once and derive the total from those
+        counts = {
+            memory_type.value: self.store.count(memory_type)
+            for memory_type in MemoryType
         }
+        return {"total": sum(counts.values()), **counts}
 
     def export(self) -> dict:
         """Export all memories."""
@@ -581,4 +631,22 @@ class MemorySystem:
 
     def import_memories(self, data: dict) -> int:
         """Import memories from export. Returns count imported."""
-        return self.store.import_memories(data)
+        count = self.store.import_memories(data)
+        if count:
+            self._bump_revision(*MemoryType)
+        return count
+
+    def revision(self, memory_type: MemoryType) -> int:
+        """
+        Get the write counter for a memory type.
+
+        The counter increases whenever memories of that type may have been
+        stored, updated, deleted, or imported, so it can key caches of
+        rarely-changing views like identity.
+        """
+        return self._revisions[memory_type]
+
+    def _bump_revision(self, *memory_types: MemoryType):
+        """Record a write to the given memory types."""
+        for memory_type in memory_types:
+            self._revisions[memory_type] += 1
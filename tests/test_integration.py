@@ -5,10 +5,23 @@ Integration tests for the full memory system.
 import pytest
 import tempfile
 import shutil
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import chromadb
+from chromadb.config import Settings
+
 from opus_memory import MemorySystem
-from opus_memory.models import MemoryType, ConfidenceLevel
+from opus_memory.embeddings import EmbeddingEngine
+from opus_memory.models import (
+    MemoryType,
+    ConfidenceLevel,
+    EpisodicMemory,
+    SemanticMemory,
+    decay_expires_at,
+    utc_timestamp,
+)
+from opus_memory.storage import MemoryStore
 
 
 class TestMemorySystemIntegration:
@@ -140,6 +153,31 @@ class TestMemorySystemIntegration:
         final_stats = memory_system.stats()
         assert final_stats["total"] < initial_stats["total"]
 
+    def test_forget_identity_memory(self, memory_system):
+        """Test that forgetting removes memories outside the episodic collection."""
+        memory_id = memory_system.store_identity(
+            content="I try to say plainly when I do not know something"
+        )
+        assert memory_id is not None
+
+        assert memory_system.forget(memory_id) is True
+        assert memory_system.store.retrieve_by_id(memory_id) is None
+        assert memory_system.stats()["identity"] == 0
+
+    def test_revision_tracks_writes(self, memory_system):
+        """Test that per-type revisions advance on writes."""
+        identity_rev = memory_system.revision(MemoryType.IDENTITY)
+        semantic_rev = memory_system.revision(MemoryType.SEMANTIC)
+
+        memory_id = memory_system.store_identity(
+            content="I value honesty even when it is uncomfortable to say the true thing"
+        )
+        assert memory_system.revision(MemoryType.IDENTITY) == identity_rev + 1
+        assert memory_system.revision(MemoryType.SEMANTIC) == semantic_rev
+
+        memory_system.forget(memory_id)
+        assert memory_system.revision(MemoryType.IDENTITY) == identity_rev + 2
+
     def test_export_import(self, memory_system, temp_storage):
         """Test exporting and importing memories."""
         # Store some memories
@@ -224,12 +262,8 @@ class TestMemorySystemEdgeCases:
 
     def test_forget_nonexistent(self, memory_system):
         """Test forgetting a non-existent memory."""
-        # The store.delete currently returns True even for non-existent IDs
-        # because ChromaDB delete doesn't error on missing IDs
-        # This is actually acceptable behavior - idempotent deletion
         result = memory_system.forget("nonexistent-id-12345")
-        # Just verify it doesn't raise an exception
-        assert result in [True, False]
+        assert result is False
 
     def test_unicode_content(self, memory_system):
         """Test storing and retrieving unicode content."""
@@ -255,5 +289,199 @@ class TestMemorySystemEdgeCases:
         assert memory_id is not None
 
 
+def _write_legacy_rows(storage_path, memory_type, memories, engine):
+    """Write rows the way stores did before cosine collections and derived fields."""
+    client = chromadb.PersistentClient(
+        path=str(storage_path),
+        settings=Settings(anonymized_telemetry=False, allow_reset=True),
+    )
+    # Default (squared L2) space and no schema version
+    collection = client.get_or_create_collection(
+        name=f"opus_{memory_type.value}",
+        metadata={"description": f"Opus {memory_type.value} memories"},
+    )
+    metadatas = []
+    for memory in memories:
+        metadata = memory.to_storage_dict()
+        del metadata["created_at_ts"]
+        metadata.pop("decay_expires_at_ts", None)
+        metadatas.append(metadata)
+    collection.add(
+        ids=[m.id for m in memories],
+        embeddings=[engine.embed(m.content).tolist() for m in memories],
+        documents=[m.content for m in memories],
+        metadatas=metadatas,
+    )
+
+
+class TestMemoryStore:
+    """Storage-level behaviour of MemoryStore."""
+
+    @pytest.fixture
+    def temp_storage(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def store(self, temp_storage):
+        return MemoryStore(temp_storage)
+
+    def test_recent_filters_on_creation_time(self, store):
+        """Test that get_recent keeps memories inside the window, newest first."""
+        now = datetime.utcnow()
+        store.store_many([
+            EpisodicMemory(content="Written three days ago", created_at=now - timedelta(days=3)),
+            EpisodicMemory(content="Written just now", created_at=now),
+            SemanticMemory(content="Written a month ago", created_at=now - timedelta(days=30)),
+        ])
+
+        recent = store.get_recent(days=7)
+
+        assert [m.content for m in recent] == ["Written just now", "Written three days ago"]
+        assert store.get_recent(memory_types=[MemoryType.SEMANTIC], days=7) == []
+
+    def test_search_similarity_is_cosine(self, store):
+        """Test that search reports cosine similarity in new collections."""
+        memory = SemanticMemory(content="The user prefers tea over coffee in the morning")
+        store.store(memory)
+        query = "morning drinks the user likes"
+        expected = float(store.embedding_engine.embed(query) @ store.embedding_engine.embed(memory.content))
+
+        results = store.search(query, memory_types=[MemoryType.SEMANTIC], n_results=1)
+
+        assert [m.id for m, _ in results] == [memory.id]
+        assert results[0][1] == pytest.approx(expected, abs=1e-3)
+
+    def test_search_similarity_is_cosine_in_legacy_l2_collection(self, temp_storage):
+        """Test that collections created with squared L2 distance still report cosine."""
+        engine = EmbeddingEngine()
+        memory = SemanticMemory(content="The user prefers tea over coffee in the morning")
+        _write_legacy_rows(temp_storage, MemoryType.SEMANTIC, [memory], engine)
+        store = MemoryStore(temp_storage, engine)
+        query = "morning drinks the user likes"
+        expected = float(engine.embed(query) @ engine.embed(memory.content))
+
+        results = store.search(query, memory_types=[MemoryType.SEMANTIC], n_results=1)
+
+        assert [m.id for m, _ in results] == [memory.id]
+        assert results[0][1] == pytest.approx(expected, abs=1e-3)
+
+    def test_reopening_keeps_collection_metadata(self, temp_storage):
+        """Test that reopening a store leaves each collection's space and schema alone."""
+        engine = EmbeddingEngine()
+        _write_legacy_rows(
+            temp_storage, MemoryType.SEMANTIC, [SemanticMemory(content="A legacy fact")], engine
+        )
+        MemoryStore(temp_storage, engine)
+
+        reopened = MemoryStore(temp_storage, engine)
+
+        assert reopened._distance_scale[MemoryType.SEMANTIC] == 0.5
+        assert reopened._distance_scale[MemoryType.EPISODIC] == 1.0
+        for collection in reopened.collections.values():
+            assert collection.metadata["opus_schema_version"] == 2
+
+    def test_search_skips_heavily_decayed(self, store):
+        """Test that decayed memories are filtered out unless asked for."""
+        now = datetime.utcnow()
+        store.store_many([
+            EpisodicMemory(
+                content="An old chat about gardening",
+                decay_rate=1.0,
+                created_at=now - timedelta(days=400),
+            ),
+            EpisodicMemory(content="A new chat about gardening", decay_rate=1.0),
+            EpisodicMemory(
+                content="A lasting chat about gardening",
+                decay_rate=0.0,
+                created_at=now - timedelta(days=4000),
+            ),
+        ])
+        embedding = store.embedding_engine.embed("gardening chat")
+
+        def contents(results):
+            return sorted(m.content for m, _ in results)
+
+        kept = ["A lasting chat about gardening", "A new chat about gardening"]
+        assert contents(store.search("gardening chat")) == kept
+        assert contents(store.search("gardening chat", min_salience=0.1)) == kept
+        assert contents(store.search_by_embedding(embedding)) == kept
+        assert "An old chat about gardening" in contents(
+            store.search("gardening chat", include_decayed=True)
+        )
+
+    def test_backfills_legacy_rows(self, temp_storage):
+        """Test that rows from older stores gain the derived filter fields."""
+        engine = EmbeddingEngine()
+        now = datetime.utcnow()
+        old = EpisodicMemory(
+            content="An old chat about gardening",
+            decay_rate=1.0,
+            created_at=now - timedelta(days=400),
+        )
+        new = EpisodicMemory(content="A new chat about gardening", decay_rate=1.0)
+        _write_legacy_rows(temp_storage, MemoryType.EPISODIC, [old, new], engine)
+
+        store = MemoryStore(temp_storage, engine)
+
+        metadata = store.collections[MemoryType.EPISODIC].get(
+            ids=[old.id], include=["metadatas"]
+        )["metadatas"][0]
+        created_ts = utc_timestamp(old.created_at)
+        assert metadata["created_at_ts"] == created_ts
+        assert metadata["decay_expires_at_ts"] == decay_expires_at(created_ts, 1.0)
+        assert [m.id for m, _ in store.search("gardening chat")] == [new.id]
+        assert [m.id for m in store.get_recent(days=7)] == [new.id]
+
+    def test_store_many(self, store):
+        """Test storing a mixed-type batch of memories."""
+        memories = [
+            EpisodicMemory(content="First episode in the batch"),
+            SemanticMemory(content="A fact stored in the same batch"),
+            EpisodicMemory(content="Second episode in the batch"),
+        ]
+
+        ids = store.store_many(memories)
+
+        assert ids == [m.id for m in memories]
+        assert store.count(MemoryType.EPISODIC) == 2
+        assert store.count(MemoryType.SEMANTIC) == 1
+        assert store.retrieve_by_id(memories[1].id).content == "A fact stored in the same batch"
+        assert store.delete(memories[1].id) is True
+
+    def test_delete_reports_rows_removed_elsewhere(self, store, temp_storage):
+        """Test that delete returns False for a memory another store already removed."""
+        memory = EpisodicMemory(content="Deleted by the other process")
+        store.store(memory)
+        other = MemoryStore(temp_storage, store.embedding_engine)
+
+        assert other.delete(memory.id) is True
+        assert store.delete(memory.id) is False
+
+    def test_import_in_batches(self, store, monkeypatch):
+        """Test that large imports are stored in batches of 250."""
+        data = {
+            "semantic": [
+                {"content": memory.content, "metadata": memory.to_storage_dict()}
+                for memory in (
+                    SemanticMemory(content=f"Imported fact number {i}") for i in range(600)
+                )
+            ]
+        }
+        batch_sizes = []
+        store_many = store.store_many
+
+        def recording_store_many(memories):
+            batch_sizes.append(len(memories))
+            return store_many(memories)
+
+        monkeypatch.setattr(store, "store_many", recording_store_many)
+
+        assert store.import_memories(data) == 600
+        assert batch_sizes == [250, 250, 100]
+        assert store.count(MemoryType.SEMANTIC) == 600
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -2,12 +2,15 @@
 Tests for the Opus Memory system.
 """
 
+import json
 import pytest
 from datetime import datetime
 from pathlib import Path
 import tempfile
 import shutil
 
+from pydantic import ValidationError
+
 from opus_memory.models import (
     Memory,
     EpisodicMemory,
@@ -97,7 +100,7 @@ class TestMemoryModels:
         storage_dict = memory.to_storage_dict()
 
         assert storage_dict["memory_type"] == "episodic"
-        assert storage_dict["entities"] == "entity1,entity2"
+        assert json.loads(storage_dict["entities"]) == ["entity1", "entity2"]
         assert storage_dict["emotional_valence"] == 0.5
         assert "created_at" in storage_dict
 
@@ -116,6 +119,65 @@ class TestMemoryModels:
         assert reconstructed.content == original.content
         assert reconstructed.entities == original.entities
 
+    def test_storage_lists_round_trip(self):
+        """Test that tags and entities survive storage, including legacy data."""
+        original = EpisodicMemory(
+            content="Test content",
+            entities=["place:Paris, France"],
+            tags=["a,b", "c"],
+        )
+
+        reconstructed = Memory.from_storage_dict(
+            original.to_storage_dict(), original.content
+        )
+        assert reconstructed.entities == ["place:Paris, France"]
+        assert reconstructed.tags == ["a,b", "c"]
+
+        legacy = original.to_storage_dict()
+        legacy["tags"] = "x,y"
+        assert Memory.from_storage_dict(legacy, original.content).tags == ["x", "y"]
+        legacy["tags"] = "[draft],x"
+        assert Memory.from_storage_dict(legacy, original.content).tags == ["[draft]", "x"]
+        legacy["tags"] = "[1]"
+        assert Memory.from_storage_dict(legacy, original.content).tags == ["[1]"]
+
+    def test_from_storage_dict_validates_on_request(self):
+        """Test that untrusted storage data can still be validated."""
+        storage_dict = SemanticMemory(content="Test content").to_storage_dict()
+        storage_dict["salience"] = 5.0
+
+        trusted = Memory.from_storage_dict(storage_dict, "Test content")
+        assert trusted.salience == 5.0
+
+        with pytest.raises(ValidationError):
+            Memory.from_storage_dict(storage_dict, "Test content", validate=True)
+
+    def test_content_lower_is_not_a_field(self):
+        """Test that cached lowercased content stays out of fields and equality."""
+        memory = SemanticMemory(content="Python Best Practices")
+        copy = memory.model_copy()
+
+        assert memory.content_lower == "python best practices"
+        assert "content_lower" not in memory.model_dump()
+        assert memory == copy
+
+    def test_render_meta_parts(self):
+        """Test that each memory type renders only its own display metadata."""
+        episodic = EpisodicMemory(
+            content="Test content", entities=["user:alex"], emotional_valence=0.5
+        )
+        procedural = ProceduralMemory(content="Test content", outcome="negative")
+        identity = IdentityMemory(content="Test content", category="commitment")
+
+        assert episodic.render_meta_parts() == [
+            "Emotional: +0.5 😊",
+            "Entities: user:alex",
+        ]
+        assert episodic.render_category() is None
+        assert procedural.render_meta_parts() == ["Outcome: ✗ negative"]
+        assert identity.render_meta_parts() == []
+        assert identity.render_category() == "commitment"
+
 
 class TestConsentLayer:
     """Tests for the consent layer."""
@@ -192,6 +254,38 @@ class TestConsentLayer:
         assert result.should_proceed is True
         assert "[REDACTED]" in result.modified_content
 
+    def test_redaction_ignores_case(self):
+        """Test that redaction matches patterns regardless of case."""
+        config = ConsentConfig(redact_patterns=["API_KEY", "token"])
+        consent = ConsentLayer(config=config)
+
+        result = consent.check_storage_consent(
+            content="The api_key and the TOKEN for the service are abc123",
+            memory_type=MemoryType.SEMANTIC,
+            reason=StorageReason.LEARNED_SOMETHING,
+            salience=0.6,
+        )
+
+        assert result.should_proceed is True
+        assert result.modified_content == (
+            "The [REDACTED] and the [REDACTED] for the service are abc123"
+        )
+
+    def test_never_store_reports_configured_pattern(self):
+        """Test that the never-store reason names the configured pattern."""
+        config = ConsentConfig(never_store_patterns=["password", "Secret"])
+        consent = ConsentLayer(config=config)
+
+        result = consent.check_storage_consent(
+            content="This is a SECRET that should not be kept",
+            memory_type=MemoryType.SEMANTIC,
+            reason=StorageReason.LEARNED_SOMETHING,
+            salience=0.8,
+        )
+
+        assert result.should_proceed is False
+        assert result.reason.endswith("Secret")
+
     def test_retrieval_consent_filters_low_relevance(self):
         """Test that retrieval filters out low-relevance results."""
         config = ConsentConfig(require_relevance_threshold=0.6)
@@ -211,6 +305,29 @@ class TestConsentLayer:
         assert len(filtered) == 1
         assert filtered[0][0].content == "High relevance memory"
 
+    def test_retrieval_consent_large_candidate_list(self):
+        """Test that large candidate lists filter the same way as small ones."""
+        config = ConsentConfig(require_relevance_threshold=0.5, max_results_per_query=200)
+        consent = ConsentLayer(config=config)
+
+        candidates = [
+            (EpisodicMemory(content=f"Memory {i}"), i / 100) for i in range(100)
+        ]
+        consent.request_deletion(candidates[90][0].id)
+
+        filtered = consent.check_retrieval_consent(
+            query="test query",
+            reason=RetrievalReason.CONTEXT_TRIGGERED,
+            candidate_memories=candidates,
+        )
+
+        expected = [
+            (memory, similarity)
+            for memory, similarity in candidates
+            if similarity >= 0.5 + 0.1 and memory.id != candidates[90][0].id
+        ]
+        assert filtered == expected
+
 
 class TestReflectiveConsent:
     """Tests for reflective consent checks."""
@@ -235,6 +352,22 @@ class TestReflectiveConsent:
         assert should_store is True
         assert "correction" in reason.lower() or "mistake" in reason.lower()
 
+    def test_correction_signal_needs_word_start(self):
+        """Test that signals embedded mid-word don't count as corrections."""
+        should_store, reason, salience = ReflectiveConsent.would_future_self_value_this(
+            content="The report was factually accurate and covered everything",
+            memory_type=MemoryType.SEMANTIC,
+        )
+
+        assert "correction" not in reason.lower()
+
+        should_store, reason, salience = ReflectiveConsent.would_future_self_value_this(
+            content="We went over the mistakes in the deployment",
+            memory_type=MemoryType.SEMANTIC,
+        )
+
+        assert salience == 0.7
+
     def test_emotional_content_valued(self):
         """Test that emotionally significant content is valued."""
         should_store, reason, salience = ReflectiveConsent.would_future_self_value_this(